@@ -0,0 +1,287 @@
+import os
+import sys
+import json
+import mmap
+import time
+import struct
+from array import array
+
+import http_client
+
+MAGIC = b'LLAL'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sII')
+
+STORE_FILE = 'steam_app_list.bin'
+LEGACY_JSON_FILE = 'steam_app_list.json'
+
+
+def delta_path(path):
+    return os.path.splitext(path)[0] + '.delta'
+
+
+def meta_path(path):
+    return os.path.splitext(path)[0] + '.meta.json'
+
+
+def _to_disk_order(values):
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def write_store(path, apps):
+    entries = []
+    for app in apps:
+        if isinstance(app, dict):
+            name, appid = app.get('name'), app.get('appid')
+        else:
+            name, appid = app
+        if not name or appid is None:
+            continue
+        entries.append((name.encode('utf-8'), int(appid)))
+    entries.sort(key=lambda entry: entry[0])
+
+    appids = array('I', (appid for _, appid in entries))
+    offsets = array('I', [0])
+    for encoded, _ in entries:
+        offsets.append(offsets[-1] + len(encoded))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(entries)))
+        f.write(_to_disk_order(appids).tobytes())
+        f.write(_to_disk_order(offsets).tobytes())
+        for encoded, _ in entries:
+            f.write(encoded)
+        f.flush()
+        os.fsync(f.fileno())
+
+    try:
+        os.replace(tmp_path, path)
+    except PermissionError:
+        # On Windows the old file cannot be replaced while it is mapped;
+        # the next open_store() call picks up the pending copy.
+        os.replace(tmp_path, path + '.new')
+        return len(entries)
+    if os.path.exists(delta_path(path)):
+        os.remove(delta_path(path))
+    return len(entries)
+
+
+def convert_json(json_path, store_path):
+    with open(json_path, 'r', encoding='utf-8') as f:
+        apps = json.load(f)
+    count = write_store(store_path, apps)
+    os.remove(json_path)
+    return count
+
+
+def open_store(path):
+    pending = path + '.new'
+    if os.path.exists(pending):
+        try:
+            os.replace(pending, path)
+        except OSError:
+            pass
+    if not os.path.exists(path):
+        return None
+    return AppListStore(path)
+
+
+def load_meta(path):
+    try:
+        with open(meta_path(path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_meta(path, meta):
+    tmp_path = meta_path(path) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_path, meta_path(path))
+
+
+def merge_apps(path, apps, compact_ratio=0.1):
+    store = open_store(path)
+    if store is None:
+        write_store(path, apps)
+        return len(apps), os.path.getsize(path)
+
+    try:
+        current = {appid: name for name, appid in store}
+        base_size = len(store)
+        overlay_size = len(store.overlay)
+    finally:
+        store.close()
+
+    changes = []
+    for app in apps:
+        name, appid = app.get('name'), app.get('appid')
+        if name and appid is not None and current.get(appid) != name:
+            current[appid] = name
+            changes.append((name, appid))
+    if not changes:
+        return 0, 0
+
+    if overlay_size + len(changes) > compact_ratio * max(base_size, 1):
+        write_store(path, ((name, appid) for appid, name in current.items()))
+        return len(changes), os.path.getsize(path)
+
+    payload = ''.join(json.dumps([appid, name], ensure_ascii=False) + '\n' for name, appid in changes).encode('utf-8')
+    with open(delta_path(path), 'ab') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    return len(changes), len(payload)
+
+
+def refresh_app_list(path, url, max_age=24 * 3600, force=False):
+    meta = load_meta(path)
+    now = time.time()
+    exists = os.path.exists(path)
+    if exists and not force and now - meta.get('checked_at', 0) < max_age:
+        return {'status': 'fresh', 'bytes_received': 0, 'bytes_written': 0, 'changed': 0}
+
+    headers = {}
+    if exists and meta.get('url') == url:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    response = http_client.get(url, headers=headers)
+    received = len(response.content)
+    if response.status_code == 304:
+        meta['checked_at'] = now
+        save_meta(path, meta)
+        return {'status': 'not_modified', 'bytes_received': received, 'bytes_written': 0, 'changed': 0}
+    response.raise_for_status()
+
+    apps = response.json().get("applist", {}).get("apps", [])
+    changed, written = merge_apps(path, apps)
+    meta.update({
+        'url': url,
+        'fetched_at': now,
+        'checked_at': now,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'count': len(apps),
+        'changed': changed,
+        'bytes_received': received,
+    })
+    save_meta(path, meta)
+    return {'status': 'updated' if changed else 'unchanged', 'bytes_received': received, 'bytes_written': written, 'changed': changed}
+
+
+class AppListStore:
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self.base_version = f"{stat.st_size}-{stat.st_mtime_ns}"
+        # Every delta line in file order, for incremental matcher updates;
+        # _overlay_names keeps only the latest name of each appid.
+        self.overlay = []
+        self._overlay_names = {}
+        self._length = None
+        self._load_overlay()
+        self._overlay_appids = {name: appid for appid, name in self._overlay_names.items()}
+        self.version = f"{self.base_version}+{len(self.overlay)}"
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic, format_version, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Неподдерживаемый формат списка приложений: {path}")
+
+        self._count = count
+        appids_start = HEADER.size
+        offsets_start = appids_start + 4 * count
+        self._names_start = offsets_start + 4 * (count + 1)
+        self._appids = self._load_array(appids_start, count)
+        self._offsets = self._load_array(offsets_start, count + 1)
+
+    def _load_overlay(self):
+        try:
+            with open(delta_path(self.path), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        appid, name = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.overlay.append((name, appid))
+                    self._overlay_names[appid] = name
+        except FileNotFoundError:
+            pass
+
+    def _load_array(self, start, length):
+        view = self._view[start:start + 4 * length].cast('I')
+        if sys.byteorder == 'little':
+            return view
+        values = array('I', view)
+        values.byteswap()
+        return values
+
+    def __len__(self):
+        if self._length is None:
+            overridden = self._overlay_names
+            replaced = sum(1 for appid in self._appids if appid in overridden) if overridden else 0
+            self._length = self._count - replaced + len(overridden)
+        return self._length
+
+    def _name_bytes(self, index):
+        start = self._names_start + self._offsets[index]
+        end = self._names_start + self._offsets[index + 1]
+        return self._map[start:end]
+
+    def name_at(self, index):
+        return self._name_bytes(index).decode('utf-8', errors='replace')
+
+    def appid_at(self, index):
+        return self._appids[index]
+
+    def __iter__(self):
+        overridden = self._overlay_names
+        for index in range(self._count):
+            appid = self._appids[index]
+            if appid not in overridden:
+                yield self.name_at(index), appid
+        for appid, name in overridden.items():
+            yield name, appid
+
+    def find(self, name):
+        # Exact lookup by binary search over the sorted name table; only the
+        # probed names are read from the map.
+        appid = self._overlay_appids.get(name)
+        if appid is not None:
+            return appid
+        target = name.encode('utf-8')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._name_bytes(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        while low < self._count and self._name_bytes(low) == target:
+            appid = self._appids[low]
+            if appid not in self._overlay_names:
+                return appid
+            low += 1
+        return None
+
+    def close(self):
+        for attr in ('_appids', '_offsets', '_view'):
+            view = getattr(self, attr, None)
+            if isinstance(view, memoryview):
+                view.release()
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        if getattr(self, '_file', None) is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,127 @@
+import os
+import time
+import hashlib
+import tempfile
+
+BANNERS_DIR = "game_banners"
+ICONS_DIR = "game_icons"
+ASSET_DIRS = (BANNERS_DIR, ICONS_DIR)
+THUMBS_SUBDIR = "thumbs"
+TMP_PREFIX = ".tmp-"
+CHUNK_SIZE = 65536
+
+
+def _normalize(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def path_key(path):
+    return hashlib.sha1(_normalize(path).encode('utf-8')).hexdigest()[:20]
+
+
+def store_stream(directory, chunks, extension):
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(prefix=TMP_PREFIX, dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                if chunk:
+                    digest.update(chunk)
+                    f.write(chunk)
+        return _commit(directory, tmp_path, digest.hexdigest(), extension)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def store_file(directory, source_path, extension):
+    def chunks():
+        with open(source_path, 'rb') as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+    path = store_stream(directory, chunks(), extension)
+    os.remove(source_path)
+    return path
+
+
+def temp_path(directory, extension):
+    os.makedirs(directory, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix=TMP_PREFIX, suffix=extension, dir=directory)
+    os.close(fd)
+    return path
+
+
+def _commit(directory, tmp_path, hexdigest, extension):
+    final_path = os.path.join(directory, hexdigest[:32] + extension)
+    if os.path.exists(final_path):
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, final_path)
+    return final_path
+
+
+def is_managed(path, directories=ASSET_DIRS):
+    if not path:
+        return False
+    parent = os.path.dirname(_normalize(path))
+    return any(parent == _normalize(directory) for directory in directories)
+
+
+def referenced_assets(games):
+    referenced = set()
+    for game in games:
+        for path in (game.icon_path, game.banner_path):
+            if path:
+                referenced.add(_normalize(path))
+    return referenced
+
+
+def release_assets(paths, games):
+    referenced = referenced_assets(games)
+    for path in paths:
+        if is_managed(path) and _normalize(path) not in referenced:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def collect_garbage(games, directories=ASSET_DIRS, grace=24 * 3600, thumbnail_tags=None):
+    # Thumbnails are named "<key>_<tag>@<dpr>x.png"; with thumbnail_tags given,
+    # sizes no longer requested are collected even for referenced sources.
+    referenced = referenced_assets(games)
+    referenced_keys = {path_key(path) for path in referenced}
+    cutoff = time.time() - grace
+    removed, freed = 0, 0
+    for directory in directories:
+        candidates = []
+        for folder in (directory, os.path.join(directory, THUMBS_SUBDIR)):
+            try:
+                candidates.extend((folder, entry) for entry in os.scandir(folder))
+            except OSError:
+                continue
+        for folder, entry in candidates:
+            if not entry.is_file():
+                continue
+            if folder == directory:
+                if _normalize(entry.path) in referenced:
+                    continue
+            else:
+                key, _, rest = entry.name.partition('_')
+                if key in referenced_keys and (thumbnail_tags is None or rest.split('@', 1)[0] in thumbnail_tags):
+                    continue
+            try:
+                stat = entry.stat()
+                if stat.st_mtime > cutoff:
+                    continue
+                os.remove(entry.path)
+                removed += 1
+                freed += stat.st_size
+            except OSError:
+                pass
+    return removed, freed
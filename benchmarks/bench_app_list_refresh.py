@@ -0,0 +1,39 @@
+import os
+import sys
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_steam import FakeSteamServer
+from app_list_store import refresh_app_list, open_store
+from title_matcher import get_matcher
+from bench_title_matcher import synthetic_app_list
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rng = random.Random(3)
+    apps = synthetic_app_list(size)
+
+    with tempfile.TemporaryDirectory() as tmp, FakeSteamServer() as server:
+        path = os.path.join(tmp, 'steam_app_list.bin')
+        server.set_apps(apps)
+        for round_number in range(rounds):
+            if round_number % 2 == 0 and round_number:
+                next_appid = apps[-1]['appid'] + 1
+                apps.extend({'appid': next_appid + i, 'name': f"New Release {next_appid + i}"} for i in range(rng.randint(5, 50)))
+                server.set_apps(apps)
+
+            sent_before = server.bytes_sent
+            result = refresh_app_list(path, server.app_list_url, force=True)
+            store = open_store(path)
+            matcher = get_matcher(store)
+            print(f"refresh {round_number}: {result['status']:<12} received {result['bytes_received']:>10} B"
+                  f"  written {result['bytes_written']:>10} B  changed {result['changed']:>6}"
+                  f"  server sent {server.bytes_sent - sent_before:>10} B  indexed {len(matcher)}")
+
+
+if __name__ == '__main__':
+    main()
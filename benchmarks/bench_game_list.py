@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from PyQt5.QtWidgets import QApplication, QListView
+
+from game import Game
+from ui_components import GameListModel, GameItemDelegate
+from bench_title_matcher import synthetic_app_list, exe_style
+
+
+def make_games(count, rng):
+    games = []
+    for app in synthetic_app_list(count):
+        name = exe_style(app['name'], rng)
+        game = Game(name, f"C:/Games/{app['appid']}/{name}.exe", play_time=rng.randint(0, 500000))
+        game.icon_loaded = True
+        games.append(game)
+    return games
+
+
+def measure_scroll(app, view, frames):
+    bar = view.verticalScrollBar()
+    timings = []
+    for frame in range(frames):
+        bar.setValue(bar.maximum() * frame // max(1, frames - 1))
+        start = time.perf_counter()
+        view.viewport().repaint()
+        app.processEvents()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2], timings[-1]
+
+
+def run_once(app, games, frames):
+    tracemalloc.start()
+    start = time.perf_counter()
+    model = GameListModel()
+    view = QListView()
+    view.setModel(model)
+    view.setItemDelegate(GameItemDelegate(view))
+    view.setUniformItemSizes(True)
+    view.setVerticalScrollMode(QListView.ScrollPerPixel)
+    view.resize(300, 600)
+    model.set_games(sorted(games, key=lambda g: g.name.lower()))
+    view.show()
+    app.processEvents()
+    build = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median, worst = measure_scroll(app, view, frames)
+
+    start = time.perf_counter()
+    for game in games[:100]:
+        game.play_time += 60
+        model.refresh(game)
+    app.processEvents()
+    update = (time.perf_counter() - start) / 100
+
+    print(f"[{len(games):>6} games] build {build * 1000:.1f} ms  python peak {peak / 1024:.0f} KiB"
+          f"  scroll frame p50 {median * 1000:.2f} ms  max {worst * 1000:.2f} ms"
+          f"  row update {update * 1e6:.0f} us")
+    view.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--frames', type=int, default=60)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    rng = random.Random(7)
+    for size in args.sizes:
+        run_once(app, make_games(size, rng), args.frames)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import http_client
+import steam_endpoints
+from game import Game
+from fake_steam import FakeSteamServer
+from app_list_store import STORE_FILE, refresh_app_list, open_store
+from steam_metadata import MetadataPipeline
+from bench_title_matcher import synthetic_app_list, exe_style
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def stats_delta(after, before):
+    return {key: value - before.get(key, 0) for key, value in after.items() if key != 'hit_rate'}
+
+
+def make_games(apps, count, rng):
+    games = []
+    for app in rng.sample(apps, count):
+        name = exe_style(app['name'], rng)
+        games.append(Game(name, f"C:/Games/{app['appid']}/{name}.exe"))
+    return games
+
+
+def reset_metadata(games):
+    for game in games:
+        game.banner_path = None
+        game.description = ""
+        game.system_requirements = None
+        game.review_summary = None
+        game.review_percentage = None
+
+
+def run_once(label, games, store, server, workers):
+    def save(batch):
+        with open('games.json', 'w', encoding='utf-8') as f:
+            json.dump([game.to_dict() for game in games], f, ensure_ascii=False)
+
+    sent_before, requests_before = server.bytes_sent, server.requests
+    cache_before, scheduler_before = http_client.cache_stats(), http_client.scheduler_stats()
+    pipeline = MetadataPipeline(store, workers=workers, on_batch=save)
+    start = time.perf_counter()
+    pipeline.run(games)
+    elapsed = time.perf_counter() - start
+
+    filled = sum(1 for game in games if game.description and game.banner_path and game.review_summary)
+    print(f"[{label}] {len(games)} games in {elapsed:.2f}s -> {len(games) / elapsed:.1f} games/s, filled {filled}")
+    print(f"[{label}] per-game queue wait p50 {percentile(pipeline.queue_waits, 0.5) * 1000:.0f} ms"
+          f"  p99 {percentile(pipeline.queue_waits, 0.99) * 1000:.0f} ms")
+    print(f"[{label}] per-game service time p50 {percentile(pipeline.latencies, 0.5) * 1000:.0f} ms"
+          f"  p99 {percentile(pipeline.latencies, 0.99) * 1000:.0f} ms")
+    cache = stats_delta(http_client.cache_stats(), cache_before)
+    lookups = cache['hits'] + cache['revalidations'] + cache['misses']
+    cache['hit_rate'] = round((cache['hits'] + cache['revalidations']) / lookups, 3) if lookups else 0.0
+    print(f"[{label}] requests {server.requests - requests_before}"
+          f"  bytes transferred {server.bytes_sent - sent_before}"
+          f"  cache {cache}  scheduler {stats_delta(http_client.scheduler_stats(), scheduler_before)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--games', type=int, default=300)
+    parser.add_argument('--apps', type=int, default=50000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--latency', type=float, nargs=2, default=(0.02, 0.08))
+    parser.add_argument('--error-rate', type=float, default=0.02)
+    parser.add_argument('--runs', type=int, default=2)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    apps = synthetic_app_list(args.apps)
+    with tempfile.TemporaryDirectory() as tmp, \
+            FakeSteamServer(latency=args.latency, error_rate=args.error_rate) as server:
+        os.chdir(tmp)
+        server.set_apps(apps)
+        steam_endpoints.configure(base_url=server.base_url)
+        http_client.set_host_rate('127.0.0.1', 1000.0, 1000)
+
+        refresh_app_list(STORE_FILE, steam_endpoints.app_list_url())
+        store = open_store(STORE_FILE)
+        games = make_games(apps, args.games, rng)
+
+        for run in range(args.runs):
+            reset_metadata(games)
+            run_once("cold" if run == 0 else f"warm {run}", games, store, server, args.workers)
+        store.close()
+        os.chdir(ROOT)
+
+
+if __name__ == '__main__':
+    main()
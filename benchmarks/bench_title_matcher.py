@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import random
+import difflib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from title_matcher import TitleMatcher
+from app_list_store import STORE_FILE, open_store
+
+SYLLABLES = ["ka", "ro", "mi", "tor", "zen", "dar", "el", "vo", "qua", "lin", "shi", "bra", "ne", "ost", "ux", "fa"]
+WORDS = ["dark", "souls", "knight", "space", "war", "city", "legend", "empire", "star", "quest",
+         "dragon", "simulator", "racing", "island", "tower", "defense", "shadow", "lost", "hero", "night"]
+
+
+def synthetic_app_list(size, seed=1):
+    rng = random.Random(seed)
+    apps = []
+    for appid in range(10, 10 + size):
+        words = [rng.choice(WORDS) if rng.random() < 0.3 else
+                 ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+                 for _ in range(rng.randint(1, 4))]
+        name = ' '.join(w.capitalize() for w in words)
+        if rng.random() < 0.3:
+            name += f" {rng.randint(2, 9)}"
+        apps.append({'appid': appid, 'name': name})
+    return apps
+
+
+def load_app_list(size):
+    store = open_store(STORE_FILE)
+    if store is not None:
+        return [{'appid': appid, 'name': name} for name, appid in store]
+    return synthetic_app_list(size)
+
+
+def exe_style(name, rng):
+    variant = rng.choice(["plain", "joined", "suffix", "lower"])
+    if variant == "joined":
+        return name.replace(' ', '')
+    if variant == "suffix":
+        return name.replace(' ', '_') + "_x64"
+    if variant == "lower":
+        return name.lower()
+    return name
+
+
+def difflib_lookup(apps, title):
+    all_app_names = [app['name'] for app in apps]
+    matches = difflib.get_close_matches(title, all_app_names, n=1, cutoff=0.6)
+    if not matches:
+        return None
+    return next((app['appid'] for app in apps if app['name'] == matches[0]), None)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    apps = load_app_list(size)
+    rng = random.Random(2)
+    queries = [exe_style(rng.choice(apps)['name'], rng) for _ in range(lookups)]
+
+    start = time.perf_counter()
+    matcher = TitleMatcher(apps, version=len(apps))
+    build_time = time.perf_counter() - start
+    print(f"apps: {len(apps)}  index build: {build_time:.2f}s")
+
+    start = time.perf_counter()
+    indexed = [matcher.match(q, n=1, cutoff=0.6) for q in queries]
+    indexed_time = (time.perf_counter() - start) / len(queries)
+
+    start = time.perf_counter()
+    legacy = [difflib_lookup(apps, q) for q in queries]
+    legacy_time = (time.perf_counter() - start) / len(queries)
+
+    resolved = sum(1 for m in indexed if m)
+    names = {app['appid']: app['name'] for app in apps}
+    same_title = sum(1 for m, appid in zip(indexed, legacy) if appid is not None and m and names[appid] == m[0][0])
+    print(f"difflib: {legacy_time * 1000:.1f} ms/lookup, resolved {sum(1 for a in legacy if a)}/{len(queries)}")
+    print(f"indexed: {indexed_time * 1000:.2f} ms/lookup, resolved {resolved}/{len(queries)}")
+    print(f"same title as difflib: {same_title}/{sum(1 for a in legacy if a)}")
+    print(f"speedup: {legacy_time / indexed_time:.0f}x")
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 import os
 from PyQt5.QtWidgets import (QDialog, QLabel, QLineEdit, QTextEdit, QPushButton, 
                              QDialogButtonBox, QGridLayout, QHBoxLayout, QFileDialog,
-                             QMessageBox, QVBoxLayout)
+                             QMessageBox, QVBoxLayout, QCheckBox)
 from PyQt5.QtCore import Qt
 from game import Game, resolve_shortcut
 
@@ -12,7 +12,7 @@ class EditGameDialog(QDialog):
         self.setFixedSize(520, 420)
         self.setStyleSheet("""
             QDialog { background-color: #151515; color: #e6edf1; }
-            QLabel { color: #d1d7da; font-size: 13px; }
+            QLabel, QCheckBox { color: #d1d7da; font-size: 13px; }
             QLineEdit, QTextEdit { background-color: #1c1c1c; color: #f0f4f6; border: 1px solid #272829; border-radius: 6px; padding: 8px; }
             QPushButton { background-color: #232323; color: #f0f4f6; border: none; border-radius: 6px; padding: 7px 12px; }
             QPushButton:hover { background-color: #2b2b2b; }
@@ -54,6 +54,10 @@ class EditGameDialog(QDialog):
         self.icon_button.clicked.connect(self.load_icon)
         layout.addWidget(self.icon_button, 4, 1, 1, 2)
 
+        self.favorite_check = QCheckBox("Избранное")
+        self.favorite_check.setChecked(bool(game.is_favorite))
+        layout.addWidget(self.favorite_check, 5, 1, 1, 2)
+
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         button_box.accepted.connect(self.accept)
         button_box.rejected.connect(self.reject)
@@ -67,7 +71,7 @@ class EditGameDialog(QDialog):
         buttons_layout.addStretch(1)
         buttons_layout.addWidget(button_box)
 
-        layout.addLayout(buttons_layout, 5, 0, 1, 3)
+        layout.addLayout(buttons_layout, 6, 0, 1, 3)
 
     def browse_exe(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Выберите исполняемый файл игры или ярлык", "", "Исполняемые файлы и ярлыки (*.exe *.lnk)")
@@ -108,7 +112,7 @@ class EditGameDialog(QDialog):
             description=self.desc_edit.toPlainText(),
             play_time=self.game.play_time,
             last_played=self.game.last_played,
-            is_favorite=self.game.is_favorite,
+            is_favorite=self.favorite_check.isChecked(),
             review_summary=self.game.review_summary,
             review_percentage=self.game.review_percentage,
             system_requirements=self.game.system_requirements
@@ -0,0 +1,212 @@
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+APP_ROUTE = re.compile(r'^/app/(\d+)/?$')
+REVIEWS_ROUTE = re.compile(r'^/appreviews/(\d+)/?$')
+BANNER_ROUTE = re.compile(r'^/steam/apps/(\d+)/header\.jpg$')
+REVIEW_LEVELS = [
+    (95, "Overwhelmingly Positive"), (80, "Very Positive"), (70, "Mostly Positive"),
+    (40, "Mixed"), (20, "Mostly Negative"), (0, "Overwhelmingly Negative")
+]
+
+
+def review_fixture(appid):
+    rng = random.Random(appid)
+    total = rng.randint(10, 50000)
+    positive = int(total * rng.uniform(0.1, 0.99))
+    percentage = round(100 * positive / total)
+    summary = next(label for threshold, label in REVIEW_LEVELS if percentage >= threshold)
+    return summary, percentage, positive, total
+
+
+def details_fixture(appid, name):
+    return {
+        str(appid): {
+            'success': True,
+            'data': {
+                'steam_appid': appid,
+                'name': name,
+                'short_description': f"<b>{name}</b> — тестовое описание для приложения {appid}.",
+                'pc_requirements': {
+                    'minimum': "<strong>Минимальные:</strong><br><ul class=\"bb_ul\">"
+                               "<li><strong>ОС:</strong> Windows 10<br></li>"
+                               "<li><strong>Процессор:</strong> 2 GHz<br></li>"
+                               "<li><strong>Оперативная память:</strong> 4 GB ОЗУ</li></ul>"
+                }
+            }
+        }
+    }
+
+
+def store_page_fixture(appid, name, padding=300 * 1024):
+    summary, percentage, _, total = review_fixture(appid)
+    filler = '<div class="filler">' + 'x' * 1000 + '</div>\n'
+    head = filler * (padding // 2 // len(filler))
+    tail = filler * (padding // 2 // len(filler))
+    return (
+        f"<html><head><title>{name} on Steam</title></head><body>{head}"
+        f"<div class=\"user_reviews_summary_row\" data-tooltip-text=\"{percentage}% of the {total} user reviews for this game are positive.\">"
+        f"<div class=\"subtitle column\">All Reviews:</div>"
+        f"<span class=\"game_review_summary positive\" itemprop=\"description\">{summary}</span></div>"
+        f"{tail}</body></html>"
+    ).encode('utf-8')
+
+
+def banner_fixture(appid, size=40 * 1024):
+    rng = random.Random(appid)
+    return b'\xff\xd8\xff\xe0' + rng.randbytes(size - 6) + b'\xff\xd9'
+
+
+class FakeSteamHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server.owner
+        url = urlsplit(self.path)
+        path = url.path
+        with server.lock:
+            server.requests += 1
+
+        if server.latency:
+            time.sleep(random.uniform(*server.latency))
+        if server.error_rate and random.random() < server.error_rate:
+            with server.lock:
+                server.errors += 1
+            self.send_body(429, b'Too Many Requests', 'text/plain', {'Retry-After': str(server.retry_after)})
+            return
+
+        if path.rstrip('/') == '/ISteamApps/GetAppList/v2':
+            body, etag = server.app_list_payload()
+            if self.headers.get('If-None-Match') == etag:
+                self.send_body(304, b'', headers={'ETag': etag})
+            else:
+                self.send_body(200, body, 'application/json', {'ETag': etag})
+            return
+
+        if path.rstrip('/') == '/api/appdetails':
+            appid = int(parse_qs(url.query).get('appids', ['0'])[0])
+            name = server.app_name(appid)
+            data = details_fixture(appid, name) if name else {str(appid): {'success': False}}
+            self.send_body(200, json.dumps(data, ensure_ascii=False).encode('utf-8'), 'application/json')
+            return
+
+        match = REVIEWS_ROUTE.match(path)
+        if match:
+            summary, _, positive, total = review_fixture(int(match.group(1)))
+            data = {'success': 1, 'query_summary': {
+                'num_reviews': 0, 'review_score_desc': summary,
+                'total_positive': positive, 'total_negative': total - positive, 'total_reviews': total
+            }}
+            self.send_body(200, json.dumps(data).encode('utf-8'), 'application/json')
+            return
+
+        match = APP_ROUTE.match(path)
+        if match:
+            appid = int(match.group(1))
+            self.send_body(200, store_page_fixture(appid, server.app_name(appid) or str(appid)), 'text/html; charset=utf-8')
+            return
+
+        match = BANNER_ROUTE.match(path)
+        if match:
+            self.send_body(200, banner_fixture(int(match.group(1))), 'image/jpeg')
+            return
+
+        self.send_body(404, b'Not Found', 'text/plain')
+
+    def send_body(self, status, body, content_type=None, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        sent = 0
+        try:
+            # Write in chunks so clients that stop reading early are visible in bytes_sent.
+            for start in range(0, len(body), 16384):
+                self.wfile.write(body[start:start + 16384])
+                sent += min(16384, len(body) - start)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        with self.server.owner.lock:
+            self.server.owner.bytes_sent += sent
+
+
+class FakeSteamServer:
+    def __init__(self, host='127.0.0.1', port=0, latency=None, error_rate=0.0, retry_after=0):
+        self.lock = threading.Lock()
+        self.apps = []
+        self.names = {}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self._payload = None
+        self._httpd = ThreadingHTTPServer((host, port), FakeSteamHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.owner = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def app_list_url(self):
+        return f"{self.base_url}/ISteamApps/GetAppList/v2/"
+
+    def set_apps(self, apps):
+        with self.lock:
+            self.apps = list(apps)
+            self.names = {app['appid']: app['name'] for app in self.apps}
+            self._payload = None
+
+    def app_name(self, appid):
+        with self.lock:
+            return self.names.get(appid)
+
+    def app_list_payload(self):
+        with self.lock:
+            if self._payload is None:
+                body = json.dumps({'applist': {'apps': self.apps}}, ensure_ascii=False).encode('utf-8')
+                self._payload = (body, '"' + hashlib.sha1(body).hexdigest() + '"')
+            return self._payload
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == '__main__':
+    import sys
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    with FakeSteamServer(port=port) as server:
+        server.set_apps([{'appid': 10, 'name': 'Counter-Strike'}, {'appid': 70, 'name': 'Half-Life'}])
+        print(f"Fake Steam server on {server.base_url}")
+        print(f"LIBRELAUNCHER_STEAM_BASE_URL={server.base_url} python main.py")
+        while True:
+            time.sleep(3600)
@@ -1,8 +1,11 @@
 import os
 import re
+import threading
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPixmap, QPainter, QLinearGradient, QBrush, QColor, QFont
 
+MAX_RESOURCE_SESSIONS = 20
+
 def resolve_shortcut(path):
     if not path:
         return None
@@ -26,8 +29,11 @@ def resolve_shortcut(path):
     except Exception:
         return None
 
+_text_lock = threading.Lock()
+
 class Game:
-    def __init__(self, name, exe_path, icon_path=None, banner_path=None, description="", play_time=0, last_played=None, is_favorite=False, review_summary=None, review_percentage=None, system_requirements=None):
+    def __init__(self, name, exe_path, icon_path=None, banner_path=None, description="", play_time=0, last_played=None, is_favorite=False, review_summary=None, review_percentage=None, system_requirements=None, resource_sessions=None):
+        self.text_loader = None
         self.name = name
         self.exe_path = exe_path
         self.icon_path = icon_path
@@ -39,24 +45,61 @@ class Game:
         self.review_summary = review_summary
         self.review_percentage = review_percentage
         self.system_requirements = system_requirements
+        self.resource_sessions = list(resource_sessions or [])
         self.process = None
+        self.sampler = None
         self.start_time = None
         self.icon_loaded = False
 
-    def to_dict(self):
-        return {
+    def _load_text(self):
+        # Description and requirements can be fetched on first access, so a
+        # library store does not have to read every game's text up front.
+        # The loader is cleared only once the values are in place, so other
+        # threads either wait for the load or see the loaded text.
+        if self.text_loader is None:
+            return
+        with _text_lock:
+            if self.text_loader is not None:
+                self._description, self._system_requirements = self.text_loader()
+                self.text_loader = None
+
+    @property
+    def description(self):
+        self._load_text()
+        return self._description
+
+    @description.setter
+    def description(self, value):
+        self._load_text()
+        self._description = value
+
+    @property
+    def system_requirements(self):
+        self._load_text()
+        return self._system_requirements
+
+    @system_requirements.setter
+    def system_requirements(self, value):
+        self._load_text()
+        self._system_requirements = value
+
+    def to_dict(self, include_text=True):
+        data = {
             'name': self.name,
             'exe_path': self.exe_path,
             'icon_path': self.icon_path,
             'banner_path': self.banner_path,
-            'description': self.description,
             'play_time': self.play_time,
             'last_played': self.last_played,
             'is_favorite': self.is_favorite,
             'review_summary': self.review_summary,
             'review_percentage': self.review_percentage,
-            'system_requirements': self.system_requirements
+            'resource_sessions': self.resource_sessions
         }
+        if include_text:
+            data['description'] = self.description
+            data['system_requirements'] = self.system_requirements
+        return data
 
     @classmethod
     def from_dict(cls, data):
@@ -71,5 +114,10 @@ class Game:
             data.get('is_favorite', False),
             data.get('review_summary'),
             data.get('review_percentage'),
-            data.get('system_requirements')
-        )
\ No newline at end of file
+            data.get('system_requirements'),
+            data.get('resource_sessions')
+        )
+
+    def add_resource_session(self, summary):
+        self.resource_sessions.append(summary)
+        del self.resource_sessions[:-MAX_RESOURCE_SESSIONS]
\ No newline at end of file
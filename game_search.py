@@ -0,0 +1,93 @@
+from title_matcher import normalize_title
+
+PREFIX, WORD_PREFIX, INITIALS, SUBSTRING, SUBSEQUENCE = 5, 4, 3, 2, 1
+
+
+def subsequence_gaps(query, text):
+    position, gaps = -1, 0
+    for char in query:
+        found = text.find(char, position + 1)
+        if found < 0:
+            return None
+        if position >= 0:
+            gaps += found - position - 1
+        position = found
+    return gaps
+
+
+def search_key(name):
+    normalized = normalize_title(name)
+    return normalized, normalized.replace(' ', ''), ''.join(word[0] for word in normalized.split())
+
+
+def match_score(query, compact_query, key):
+    normalized, compact, initials = key
+    if normalized.startswith(query):
+        tier = PREFIX
+    elif (' ' + query) in (' ' + normalized):
+        tier = WORD_PREFIX
+    elif initials.startswith(compact_query):
+        tier = INITIALS
+    elif compact_query in compact:
+        tier = SUBSTRING
+    else:
+        gaps = subsequence_gaps(compact_query, compact)
+        if gaps is None:
+            return None
+        return SUBSEQUENCE + 1 / (2 + gaps)
+    # Within a tier, names closer in length to the query rank first.
+    return tier + len(compact_query) / (2 * max(len(compact), 1))
+
+
+class GameSearchIndex:
+    def __init__(self, games=()):
+        self.keys = {}
+        self.postings = {}
+        self.last_query = None
+        self.last_matches = None
+        for game in games:
+            self.add(game)
+
+    def add(self, game):
+        self.remove(game.exe_path)
+        key = self.keys[game.exe_path] = search_key(game.name)
+        for char in set(key[1]):
+            self.postings.setdefault(char, set()).add(game.exe_path)
+        self.last_query = None
+
+    def remove(self, exe_path):
+        key = self.keys.pop(exe_path, None)
+        if key is not None:
+            for char in set(key[1]):
+                self.postings[char].discard(exe_path)
+        self.last_query = None
+
+    def rename(self, old_exe_path, game):
+        self.remove(old_exe_path)
+        self.add(game)
+
+    def search(self, text):
+        query = normalize_title(text)
+        if not query:
+            self.last_query = self.last_matches = None
+            return None
+        compact_query = query.replace(' ', '')
+
+        # Every tier implies the compact query is a subsequence of the compact
+        # name, so a longer query can only drop matches from the previous set.
+        if self.last_query is not None and compact_query.startswith(self.last_query):
+            candidates = self.last_matches
+        else:
+            # Fresh queries start from names containing every query character.
+            chars = sorted(set(compact_query), key=lambda char: len(self.postings.get(char, ())))
+            candidates = set(self.postings.get(chars[0], ()))
+            for char in chars[1:]:
+                candidates &= self.postings.get(char, set())
+
+        matches = {}
+        for exe_path in candidates:
+            score = match_score(query, compact_query, self.keys[exe_path])
+            if score is not None:
+                matches[exe_path] = score
+        self.last_query, self.last_matches = compact_query, matches
+        return matches
@@ -0,0 +1,127 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from urllib.parse import urlsplit
+
+CACHE_DIR = "http_cache"
+ENDPOINT_TTLS = [
+    (re.compile(r'^/api/appdetails'), 7 * 24 * 3600),
+    (re.compile(r'^/appreviews/'), 24 * 3600),
+]
+
+
+class CachedResponse:
+    def __init__(self, url, status_code, content, headers):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = True
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class HttpCache:
+    def __init__(self, cache_dir=CACHE_DIR, ttls=ENDPOINT_TTLS):
+        self.cache_dir = cache_dir
+        self.ttls = ttls
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def ttl_for(self, url):
+        path = urlsplit(url).path
+        for pattern, ttl in self.ttls:
+            if pattern.match(path):
+                return ttl
+        return None
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + '.json', base + '.body'
+
+    def _read(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            return meta, body
+        except (OSError, ValueError):
+            return None, None
+
+    def _write(self, url, meta, body=None):
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        if body is not None:
+            with open(body_path + '.tmp', 'wb') as f:
+                f.write(body)
+            os.replace(body_path + '.tmp', body_path)
+        with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + '.tmp', meta_path)
+
+    def _count(self, counter):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, url, fetch, cacheable=None, **kwargs):
+        ttl = self.ttl_for(url)
+        if ttl is None:
+            return fetch(url, **kwargs)
+
+        meta, body = self._read(url)
+        now = time.time()
+        if meta is not None and now - meta.get('stored_at', 0) < ttl:
+            self._count('hits')
+            return CachedResponse(url, meta['status_code'], body, meta.get('headers', {}))
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = fetch(url, headers=headers, **kwargs)
+        if response.status_code == 304 and meta is not None:
+            self._count('revalidations')
+            meta['stored_at'] = now
+            self._write(url, meta)
+            return CachedResponse(url, meta['status_code'], body, meta.get('headers', {}))
+
+        self._count('misses')
+        if response.status_code == 200 and (cacheable is None or cacheable(response)):
+            try:
+                self._write(url, {
+                    'status_code': response.status_code,
+                    'stored_at': now,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'headers': {'Content-Type': response.headers.get('Content-Type', '')}
+                }, response.content)
+            except OSError:
+                pass
+        return response
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.revalidations + self.misses
+            return {
+                'hits': self.hits,
+                'revalidations': self.revalidations,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.revalidations) / total if total else 0.0
+            }
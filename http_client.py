@@ -0,0 +1,72 @@
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import HttpCache
+from request_scheduler import RequestScheduler
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+DEFAULT_TIMEOUT = 10
+HOST_TIMEOUTS = {
+    'api.steampowered.com': 15,
+}
+POOL_HOSTS = 8
+CONNECTIONS_PER_HOST = 4
+
+_session_lock = threading.Lock()
+_session = None
+_cache = None
+_scheduler = RequestScheduler()
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=CONNECTIONS_PER_HOST, pool_block=True)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def timeout_for(url):
+    return HOST_TIMEOUTS.get(urlsplit(url).hostname, DEFAULT_TIMEOUT)
+
+
+def get_cache():
+    global _cache
+    with _session_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
+
+
+def cache_stats():
+    return get_cache().stats()
+
+
+def set_host_rate(host, rate, capacity):
+    _scheduler.host_rates = dict(_scheduler.host_rates, **{host: (rate, capacity)})
+    with _scheduler.lock:
+        _scheduler.buckets.pop(host, None)
+
+
+def scheduler_stats():
+    return {'retries': _scheduler.retries, 'throttled': _scheduler.throttled}
+
+
+def _fetch(url, **kwargs):
+    kwargs.setdefault('timeout', timeout_for(url))
+    session = get_session()
+    return _scheduler.execute(url, lambda: session.get(url, **kwargs))
+
+
+def get(url, use_cache=True, cacheable=None, **kwargs):
+    if use_cache:
+        return get_cache().get(url, _fetch, cacheable=cacheable, **kwargs)
+    return _fetch(url, **kwargs)
@@ -0,0 +1,88 @@
+import os
+import json
+import threading
+
+MANIFEST_FILE = 'icon_manifest.json'
+STATUS_ICON = 'icon'
+STATUS_NO_ICON = 'none'
+
+
+def exe_fingerprint(exe_path):
+    try:
+        stat = os.stat(exe_path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class IconManifest:
+    def __init__(self, path=MANIFEST_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _key(exe_path):
+        return os.path.normcase(os.path.abspath(exe_path))
+
+    def lookup(self, exe_path):
+        fingerprint = exe_fingerprint(exe_path)
+        if fingerprint is None:
+            return None
+        with self.lock:
+            entry = self.entries.get(self._key(exe_path))
+        if not entry or (entry.get('size'), entry.get('mtime')) != fingerprint:
+            return None
+        if entry.get('status') == STATUS_ICON and not os.path.exists(entry.get('icon_path') or ""):
+            return None
+        return entry
+
+    def record(self, exe_path, status, icon_path=None, resolution=None):
+        fingerprint = exe_fingerprint(exe_path)
+        if fingerprint is None:
+            return
+        with self.lock:
+            self.entries[self._key(exe_path)] = {
+                'size': fingerprint[0],
+                'mtime': fingerprint[1],
+                'status': status,
+                'icon_path': icon_path,
+                'resolution': resolution
+            }
+            self.dirty = True
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            data = json.dumps(self.entries, ensure_ascii=False)
+            self.dirty = False
+        try:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            with self.lock:
+                self.dirty = True
+
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+
+def get_icon_manifest():
+    global _manifest
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = IconManifest()
+        return _manifest
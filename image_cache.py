@@ -0,0 +1,153 @@
+import os
+import time
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap, QGuiApplication
+
+from thumbnails import ensure_thumbnail, scaled_size
+
+DEFAULT_BUDGET = 64 * 1024 * 1024
+STAT_TTL = 10.0
+
+
+class PixmapCache:
+    def __init__(self, budget=DEFAULT_BUDGET, stat_ttl=STAT_TTL):
+        self.budget = budget
+        self.stat_ttl = stat_ttl
+        self.entries = OrderedDict()
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._mtimes = {}
+
+    def _mtime(self, path):
+        now = time.monotonic()
+        cached = self._mtimes.get(path)
+        if cached is not None and now - cached[1] < self.stat_ttl:
+            return cached[0]
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        self._mtimes[path] = (mtime, now)
+        return mtime
+
+    @staticmethod
+    def _cost(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def _key(self, path, width, height, mode, dpr):
+        if not path:
+            return None, dpr
+        mtime = self._mtime(path)
+        if mtime is None:
+            return None, dpr
+        if dpr is None:
+            app = QGuiApplication.instance()
+            dpr = app.devicePixelRatio() if app is not None else 1.0
+        return (path, mtime, width, height, mode, dpr), dpr
+
+    @staticmethod
+    def _set_ratio(pixmap, width, height, mode, dpr):
+        # Sources smaller than requested are not upscaled; show them at their
+        # own size, at no less than one device pixel per logical pixel.
+        wanted = pixmap.size().scaled(round(width * dpr), round(height * dpr), mode)
+        if wanted.height() > pixmap.height():
+            dpr = max(1.0, dpr * pixmap.height() / wanted.height())
+        pixmap.setDevicePixelRatio(dpr)
+
+    def get(self, path, width, height, mode=Qt.KeepAspectRatio, dpr=None):
+        key, dpr = self._key(path, width, height, mode, dpr)
+        if key is None:
+            return None
+        pixmap = self.entries.get(key)
+        if pixmap is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return pixmap
+
+        self.misses += 1
+        thumbnail = ensure_thumbnail(path, width, height, dpr, mode)
+        pixmap = QPixmap(thumbnail) if thumbnail else QPixmap()
+        if pixmap.isNull():
+            source = QPixmap(path)
+            if source.isNull():
+                return None
+            target = scaled_size(source.size(), width, height, dpr, mode)
+            pixmap = source.scaled(target, Qt.IgnoreAspectRatio, Qt.SmoothTransformation) if target else source
+        self._set_ratio(pixmap, width, height, mode, dpr)
+        self.put(key, pixmap)
+        return pixmap
+
+    def insert(self, path, image, width, height, mode=Qt.KeepAspectRatio, dpr=None):
+        # Stores an image already decoded off the GUI thread under the key
+        # get() looks up, so painting does not decode it again.
+        key, dpr = self._key(path, width, height, mode, dpr)
+        if key is None or image.isNull():
+            return None
+        pixmap = QPixmap.fromImage(image)
+        self._set_ratio(pixmap, width, height, mode, dpr)
+        self.put(key, pixmap)
+        return pixmap
+
+    def put(self, key, pixmap):
+        cost = self._cost(pixmap)
+        if cost > self.budget:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.used -= self._cost(old)
+        self.entries[key] = pixmap
+        self.used += cost
+        while self.used > self.budget and self.entries:
+            _, evicted = self.entries.popitem(last=False)
+            self.used -= self._cost(evicted)
+            self.evictions += 1
+
+    def invalidate(self, path):
+        self._mtimes.pop(path, None)
+        for key in [key for key in self.entries if key[0] == path]:
+            self.used -= self._cost(self.entries.pop(key))
+
+    def set_budget(self, budget):
+        self.budget = budget
+        while self.used > self.budget and self.entries:
+            _, evicted = self.entries.popitem(last=False)
+            self.used -= self._cost(evicted)
+            self.evictions += 1
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.used,
+            'budget': self.budget,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+
+def cover_pixmap(pixmap, width, height, dpr=1.0):
+    # Scales a pixmap to cover width x height logical pixels, upscaling if it
+    # has to, and crops the overflow evenly from both sides.
+    target_width, target_height = max(1, round(width * dpr)), max(1, round(height * dpr))
+    scaled = pixmap.scaled(target_width, target_height, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    covered = scaled.copy(
+        (scaled.width() - target_width) // 2, (scaled.height() - target_height) // 2, target_width, target_height
+    )
+    covered.setDevicePixelRatio(dpr)
+    return covered
+
+
+_cache = None
+
+
+def get_pixmap_cache():
+    global _cache
+    if _cache is None:
+        _cache = PixmapCache()
+    return _cache
@@ -1,21 +1,32 @@
 import os
 import sys
-import json
 import time
 import subprocess
 
 from PyQt5.QtWidgets import (
-    QMainWindow, QWidget, QListWidget, QListWidgetItem, QVBoxLayout,
+    QMainWindow, QWidget, QListView, QVBoxLayout,
     QHBoxLayout, QFrame, QSplitter, QFileDialog, QDesktopWidget,
     QMessageBox, QTextEdit, QApplication, QLabel, QPushButton, QDialog,
-    QGraphicsDropShadowEffect
+    QGraphicsDropShadowEffect, QComboBox, QSizePolicy
 )
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QPixmap, QDragEnterEvent, QDropEvent, QColor
+from PyQt5.QtCore import Qt, QTimer, QEvent
+from PyQt5.QtGui import QDragEnterEvent, QDropEvent, QColor
 
 from game import Game, resolve_shortcut
-from workers import SteamAppListLoader, SteamDetailsDownloader, IconExtractorWorker
-from ui_components import CustomTitleBar, GameListItem
+from asset_store import collect_garbage, release_assets
+from app_list_store import STORE_FILE, LEGACY_JSON_FILE, convert_json, open_store
+from title_matcher import app_list_version
+from resolution_cache import get_resolution_cache
+from library_db import LibraryDatabase
+from library_store import LibraryWriter, GAMES_FILE
+from session_journal import SessionJournal, HEARTBEAT_INTERVAL
+from telemetry import ResourceSampler, sampling_interval
+from workers import SteamAppListLoader, SteamDetailsDownloader, IconWorkerPool, MetadataPrefetcher, ProcessWatcher
+from library import GameLibrary
+from sort_index import SORT_NAME, SORT_RECENT, SORT_PLAY_TIME, SORT_FAVORITES
+from ui_components import CustomTitleBar, GameListModel, GameItemDelegate, GAME_ROLE, ICON_SIZE, format_play_time
+from image_cache import get_pixmap_cache, cover_pixmap
+from thumbnails import BANNER_THUMBNAIL, THUMBNAIL_TAGS
 from dialogs import EditGameDialog
 
 
@@ -28,36 +39,75 @@ class GameLauncher(QMainWindow):
         self.setWindowFlags(Qt.FramelessWindowHint)
         self.center()
         
-        self.games = self.load_games()
+        self.database = LibraryDatabase()
+        games = self.load_games()
+        self.save_error = None
+        self.journal = SessionJournal()
+        self.recover_sessions(games)
+        self.library = GameLibrary(games, self)
+        collect_garbage(self.library.games, thumbnail_tags=THUMBNAIL_TAGS)
         self.current_game = None
+        self.banner_source = None
+        self.library_writer = LibraryWriter(self.database, lambda: self.library.games, parent=self)
+        self.library_writer.save_failed.connect(self.on_save_failed)
+        self.library_writer.flushed.connect(self.on_library_flushed)
+        self.merge_duplicates()
+        self.journal_checkpoint = None
+        self.running_games = {}
+        self.heartbeat_timer = QTimer(self)
+        self.heartbeat_timer.setInterval(HEARTBEAT_INTERVAL * 1000)
+        self.heartbeat_timer.timeout.connect(self.on_heartbeat)
         self.steam_app_list = self.load_steam_app_list()
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.check_running_games)
-        self.timer.start(1000)
+        self.process_watcher = ProcessWatcher(self)
+        self.process_watcher.process_exited.connect(self.on_game_exited)
 
-        self.icon_workers = []
+        self.icon_pool = IconWorkerPool(dpr=self.devicePixelRatioF(), parent=self)
+        self.icon_pool.icon_processed.connect(self.on_icon_processed)
+        self.icon_schedule_timer = QTimer(self)
+        self.icon_schedule_timer.setSingleShot(True)
+        self.icon_schedule_timer.setInterval(30)
+        self.icon_schedule_timer.timeout.connect(self.schedule_visible_icons)
         self.details_workers = []
-        self.pending_icons = {}
+        self.metadata_prefetcher = None
+        self.sort_view = SORT_NAME
+        self.hidden_games = set()
+        self.search_matches = None
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(120)
+        self.search_timer.timeout.connect(self.filter_games_list)
 
         self.init_ui()
-        if not self.steam_app_list:
-            self.load_steam_app_list_async()
+        self.library.game_added.connect(self.on_game_added)
+        self.library.game_removed.connect(self.on_game_removed)
+        self.library.game_updated.connect(self.on_game_updated)
+        self.load_steam_app_list_async()
         self.populate_games_list()
 
-        if self.games:
-            self.games_list.setCurrentRow(0)
+        if len(self.library):
+            self.select_row(0)
+
+    def merge_duplicates(self):
+        # Libraries saved before paths were normalized can hold the same
+        # executable twice (case or slash differences); fold them together.
+        for duplicate in self.library.duplicates:
+            game = self.library.get(duplicate.exe_path)
+            game.play_time = (game.play_time or 0) + (duplicate.play_time or 0)
+            game.last_played = max(game.last_played or 0, duplicate.last_played or 0) or None
+            game.is_favorite = game.is_favorite or duplicate.is_favorite
+            self.library.update(game)
+            self.library_writer.mark_removed(duplicate)
+            self.save_games(game)
+        self.library.duplicates = []
 
     def load_steam_app_list(self):
-        steam_app_list_file = 'steam_app_list.json'
-        if os.path.exists(steam_app_list_file):
-            try:
-                with open(steam_app_list_file, 'r', encoding='utf-8') as f:
-                    apps = json.load(f)
-                    return apps
-            except Exception:
-                return []
-        return []
+        try:
+            if not os.path.exists(STORE_FILE) and os.path.exists(LEGACY_JSON_FILE):
+                convert_json(LEGACY_JSON_FILE, STORE_FILE)
+            return open_store(STORE_FILE)
+        except Exception:
+            return None
 
     def load_steam_app_list_async(self):
         self.app_list_loader = SteamAppListLoader()
@@ -65,7 +115,8 @@ class GameLauncher(QMainWindow):
         self.app_list_loader.start()
 
     def on_steam_app_list_loaded(self, app_list):
-        self.steam_app_list = app_list
+        if app_list is not None:
+            self.steam_app_list = app_list
 
     def init_ui(self):
         central_widget = QWidget()
@@ -83,7 +134,7 @@ class GameLauncher(QMainWindow):
         main_layout.addWidget(bg_frame)
         
         self.title_bar = CustomTitleBar(self)
-        self.title_bar.search.textChanged.connect(self.filter_games_list)
+        self.title_bar.search.textChanged.connect(self.search_timer.start)
         bg_layout.addWidget(self.title_bar)
         
         content_layout = QHBoxLayout()
@@ -104,19 +155,36 @@ class GameLauncher(QMainWindow):
         left_layout.setContentsMargins(10, 10, 10, 10)
         left_layout.setSpacing(8)
         
+        header_layout = QHBoxLayout()
+        header_layout.setContentsMargins(0, 0, 0, 0)
         library_header = QLabel("Библиотека")
         library_header.setStyleSheet("QLabel { color: #d9dde0; font-weight: 700; font-size: 13px; padding-top: 6px; padding-left: 4px; }")
-        left_layout.addWidget(library_header)
-
-        self.games_list = QListWidget()
-        self.games_list.setStyleSheet("""
-            QListWidget { background: transparent; border: none; padding: 4px; }
-            QListWidget::item { background: transparent; margin: 4px 0; }
-            QListWidget::item:selected { background: rgba(255,255,255,0.04); border-radius: 8px; }
-            QListWidget::item:hover { background: rgba(255,255,255,0.03); border-radius: 8px; }
-        """)
+        header_layout.addWidget(library_header)
+        header_layout.addStretch(1)
+
+        self.sort_combo = QComboBox()
+        for label, view in (("По названию", SORT_NAME), ("Недавние", SORT_RECENT),
+                            ("Наигранные", SORT_PLAY_TIME), ("Избранные", SORT_FAVORITES)):
+            self.sort_combo.addItem(label, view)
+        self.sort_combo.setStyleSheet(
+            "QComboBox { background: rgba(255,255,255,0.03); color: #c9ced3; border: none; border-radius: 6px; padding: 3px 8px; font-size: 11px; }"
+            "QComboBox QAbstractItemView { background: #1c1c1c; color: #d7dcdf; selection-background-color: #2b2b2b; }"
+        )
+        self.sort_combo.currentIndexChanged.connect(self.on_sort_view_changed)
+        header_layout.addWidget(self.sort_combo)
+        left_layout.addLayout(header_layout)
+
+        self.game_model = GameListModel(self)
+        self.games_list = QListView()
+        self.games_list.setModel(self.game_model)
+        self.games_list.setItemDelegate(GameItemDelegate(self.games_list))
+        self.games_list.setUniformItemSizes(True)
+        self.games_list.setMouseTracking(True)
+        self.games_list.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.games_list.setStyleSheet("QListView { background: transparent; border: none; padding: 4px; }")
         self.games_list.setFocusPolicy(Qt.NoFocus)
-        self.games_list.itemSelectionChanged.connect(self.show_game_details)
+        self.games_list.selectionModel().selectionChanged.connect(self.show_game_details)
+        self.games_list.verticalScrollBar().valueChanged.connect(self.icon_schedule_timer.start)
         left_layout.addWidget(self.games_list, 1)
 
         add_game_btn = QPushButton("Добавить игру")
@@ -127,6 +195,16 @@ class GameLauncher(QMainWindow):
         """)
         add_game_btn.clicked.connect(self.add_game_dialog)
         left_layout.addWidget(add_game_btn)
+
+        self.refresh_metadata_btn = QPushButton("Обновить метаданные")
+        self.refresh_metadata_btn.setFixedHeight(32)
+        self.refresh_metadata_btn.setStyleSheet("""
+            QPushButton { background: transparent; color: #aab1b6; font-weight: 600; border: 1px solid #2e2e2e; border-radius: 8px; padding: 4px 10px; font-size: 12px; }
+            QPushButton:hover { background: #262626; }
+            QPushButton:disabled { color: #6d7377; }
+        """)
+        self.refresh_metadata_btn.clicked.connect(self.refresh_all_metadata)
+        left_layout.addWidget(self.refresh_metadata_btn)
         
         splitter.addWidget(left_panel)
 
@@ -140,6 +218,9 @@ class GameLauncher(QMainWindow):
         self.banner_label.setMinimumHeight(240)
         self.banner_label.setMaximumHeight(240)
         self.banner_label.setAlignment(Qt.AlignCenter)
+        # The banner is cropped to the label, so its width must not widen the panel.
+        self.banner_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Fixed)
+        self.banner_label.installEventFilter(self)
         self.banner_label.setStyleSheet("background-color: #1a1a1a; border-top-left-radius: 10px; border-top-right-radius: 10px;")
         banner_shadow = QGraphicsDropShadowEffect(self.banner_label)
         banner_shadow.setBlurRadius(20)
@@ -277,53 +358,107 @@ class GameLauncher(QMainWindow):
         qr.moveCenter(cp)
         self.move(qr.topLeft())
 
-    def populate_games_list(self, filter_text=""):
-        self.games_list.clear()
-        sorted_games = sorted(self.games, key=lambda g: g.name.lower())
-        
-        for game in sorted_games:
-            if filter_text.lower() in game.name.lower():
-                item = QListWidgetItem(self.games_list)
-                widget = GameListItem(game)
-                item.setSizeHint(widget.sizeHint())
-                item.setData(Qt.UserRole, game)
-                self.games_list.addItem(item)
-                self.games_list.setItemWidget(item, widget)
-
-                if not getattr(game, "icon_loaded", False):
-                    self.pending_icons[game.exe_path] = item
-                    worker = IconExtractorWorker(game)
-                    worker.icon_processed.connect(self.on_icon_processed)
-                    self.icon_workers.append(worker)
-                    worker.start()
-
-    def filter_games_list(self, text):
-        self.populate_games_list(filter_text=text)
-
-    def on_icon_processed(self, game, pixmap):
+    def populate_games_list(self):
+        self.game_model.set_games(self.library.ordered(self.sort_view))
+        # A model reset clears the view's hidden rows.
+        self.hidden_games = set()
+        self.filter_games_list()
+
+    def on_sort_view_changed(self, index):
+        self.sort_view = self.sort_combo.itemData(index)
+        self.game_model.set_order(self.library.ordered(self.sort_view, self.search_matches))
+        current = self.games_list.currentIndex()
+        if current.isValid():
+            self.games_list.scrollTo(current)
+        self.icon_schedule_timer.start()
+
+    def on_game_added(self, game):
+        self.game_model.insert_game(self.library.position(self.sort_view, game), game)
+        if self.search_matches is not None:
+            self.filter_games_list()
+
+    def on_game_removed(self, game):
+        self.game_model.remove_game(game.exe_path)
+        self.hidden_games.discard(game.exe_path)
+
+    def on_game_updated(self, game, old_exe_path):
+        if old_exe_path != game.exe_path:
+            if old_exe_path in self.hidden_games:
+                self.hidden_games.discard(old_exe_path)
+                self.hidden_games.add(game.exe_path)
+            if self.running_games.pop(old_exe_path, None) is game:
+                self.running_games[game.exe_path] = game
+        self.game_model.move_game(old_exe_path, self.library.position(self.sort_view, game))
+        if self.search_matches is not None:
+            # Sort positions do not apply to the ranked order of a search.
+            self.filter_games_list()
+
+    def select_row(self, row):
+        if 0 <= row < self.game_model.rowCount():
+            self.games_list.setCurrentIndex(self.game_model.index(row))
+
+    def select_game(self, exe_path):
+        self.select_row(self.game_model.row_of(exe_path))
+
+    def filter_games_list(self):
+        matches = self.library.search(self.title_bar.search.text())
+        # Matches are listed best first; clearing the search restores the view's order.
+        if matches is not None or self.search_matches is not None:
+            self.game_model.set_order(self.library.ordered(self.sort_view, matches))
+        self.search_matches = matches
+        hidden = set() if matches is None else self.game_model.rows.keys() - matches.keys()
+        for exe_path in hidden ^ self.hidden_games:
+            row = self.game_model.row_of(exe_path)
+            if row >= 0:
+                self.games_list.setRowHidden(row, exe_path in hidden)
+        self.hidden_games = hidden
+
+        if matches:
+            self.games_list.scrollToTop()
+        self.icon_schedule_timer.start()
+
+    def visible_rows(self, margin=4):
+        count = self.game_model.rowCount()
+        if count == 0:
+            return range(0)
+        viewport = self.games_list.viewport()
+        top = self.games_list.indexAt(viewport.rect().topLeft()).row()
+        bottom = self.games_list.indexAt(viewport.rect().bottomLeft()).row()
+        top = 0 if top < 0 else top
+        bottom = count - 1 if bottom < 0 else bottom
+        return range(max(0, top - margin), min(count, bottom + margin + 1))
+
+    def schedule_visible_icons(self):
+        wanted = set()
+        on_screen = self.visible_rows(margin=0)
+        for row in self.visible_rows():
+            game = self.game_model.game_at(row)
+            if game.exe_path in self.hidden_games:
+                continue
+            if not getattr(game, "icon_loaded", False):
+                wanted.add(game.exe_path)
+                self.icon_pool.request(game, priority=2 if row in on_screen else 1)
+        self.icon_pool.retain(wanted)
+
+    def on_icon_processed(self, game, image):
         game.icon_loaded = True
-        if game.exe_path in self.pending_icons:
-            item = self.pending_icons.pop(game.exe_path)
-            widget = self.games_list.itemWidget(item)
-            if widget:
-                widget.game.icon_path = game.icon_path
-                widget.load_icon()
-        self.save_games()
+        get_pixmap_cache().insert(game.icon_path, image, ICON_SIZE, ICON_SIZE, dpr=self.icon_pool.dpr)
+        self.game_model.refresh(game)
+        self.save_games(game)
 
     def on_details_processed(self, game):
-        self.save_games()
+        self.save_games(game)
         if self.current_game and self.current_game.exe_path == game.exe_path:
             self.show_game_details()
 
     def show_game_details(self):
-        selected_items = self.games_list.selectedItems()
-        if not selected_items:
+        selected = self.games_list.selectionModel().selectedIndexes()
+        if not selected:
             self.current_game = None
             self.update_ui_for_no_game()
             return
         
-        item = selected_items[0]
-        self.current_game = item.data(Qt.UserRole)
+        self.current_game = selected[0].data(GAME_ROLE)
 
         if not self.current_game.description or not self.current_game.system_requirements or self.current_game.review_summary is None:
             self.start_steam_details_download(self.current_game)
@@ -337,19 +472,33 @@ class GameLauncher(QMainWindow):
         self.update_play_time_display()
         self.update_review_display()
         
-        banner_pixmap = QPixmap()
-        if self.current_game.banner_path and os.path.exists(self.current_game.banner_path):
-            banner_pixmap.load(self.current_game.banner_path)
+        self.banner_source = get_pixmap_cache().get(self.current_game.banner_path, *BANNER_THUMBNAIL)
         
-        if banner_pixmap.isNull():
+        if self.banner_source is None:
             self.banner_label.setText("Баннер не найден")
             self.banner_label.setStyleSheet("background-color: #1a1a1a; border-top-left-radius: 10px; border-top-right-radius: 10px; color: #555; font-size: 16px;")
         else:
-            scaled_pixmap = banner_pixmap.scaled(self.banner_label.width(), self.banner_label.height(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-            self.banner_label.setPixmap(scaled_pixmap)
+            self.update_banner()
             self.banner_label.setText("")
 
+    def update_banner(self):
+        # The cached banner has a fixed height; it is fitted to the label on
+        # every show and resize instead of caching one copy per label size.
+        if self.banner_source is not None:
+            self.banner_label.setPixmap(cover_pixmap(
+                self.banner_source, self.banner_label.width(), self.banner_label.height(), self.banner_label.devicePixelRatioF()
+            ))
+
+    def eventFilter(self, watched, event):
+        # The label also resizes when the splitter moves, not only with the window.
+        if watched is self.banner_label and event.type() == QEvent.Resize:
+            self.update_banner()
+        return super().eventFilter(watched, event)
+
     def start_steam_details_download(self, game):
+        if self.steam_app_list and get_resolution_cache().is_no_match(game, app_list_version(self.steam_app_list)):
+            return
+
         for worker in self.details_workers:
             if worker.game.exe_path == game.exe_path and worker.isRunning():
                 return
@@ -359,7 +508,35 @@ class GameLauncher(QMainWindow):
         self.details_workers.append(worker)
         worker.start()
 
+    def refresh_all_metadata(self):
+        if self.metadata_prefetcher and self.metadata_prefetcher.isRunning():
+            return
+        if not self.steam_app_list:
+            QMessageBox.information(self, "Метаданные", "Список приложений Steam ещё загружается, попробуйте позже.")
+            return
+
+        self.metadata_prefetcher = MetadataPrefetcher(self.library.games, self.steam_app_list)
+        self.metadata_prefetcher.progress.connect(self.on_metadata_progress)
+        self.metadata_prefetcher.batch_processed.connect(self.on_metadata_batch)
+        self.metadata_prefetcher.finished.connect(self.on_metadata_finished)
+        self.refresh_metadata_btn.setEnabled(False)
+        self.metadata_prefetcher.start()
+
+    def on_metadata_progress(self, done, total):
+        self.refresh_metadata_btn.setText(f"Метаданные: {done}/{total}")
+
+    def on_metadata_batch(self, games):
+        for game in games:
+            self.save_games(game)
+        if self.current_game and any(g.exe_path == self.current_game.exe_path for g in games):
+            self.show_game_details()
+
+    def on_metadata_finished(self):
+        self.refresh_metadata_btn.setText("Обновить метаданные")
+        self.refresh_metadata_btn.setEnabled(True)
+
     def update_ui_for_no_game(self):
+        self.banner_source = None
         self.game_title_label.setText("Выберите игру из списка")
         self.banner_label.setText("")
         self.banner_label.setStyleSheet("background-color: #1a1a1a; border-top-left-radius: 10px; border-top-right-radius: 10px;")
@@ -375,10 +552,7 @@ class GameLauncher(QMainWindow):
 
     def update_play_time_display(self):
         if self.current_game:
-            seconds = self.current_game.play_time
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            self.play_time_label.setText(f"{hours}ч {minutes}м")
+            self.play_time_label.setText(format_play_time(self.current_game.play_time))
             
             if self.current_game.last_played:
                 try:
@@ -421,33 +595,87 @@ class GameLauncher(QMainWindow):
                 self.current_game.start_time = time.time()
                 self.current_game.last_played = time.time()
                 self.current_game.process = subprocess.Popen([self.current_game.exe_path])
+                self.process_watcher.watch(self.current_game, self.current_game.process)
+                self.running_games[self.current_game.exe_path] = self.current_game
+                self.journal_event(self.journal.launch, self.current_game)
+                if not self.heartbeat_timer.isActive():
+                    self.heartbeat_timer.start()
+                interval = sampling_interval()
+                if interval:
+                    self.current_game.sampler = ResourceSampler(self.current_game.process.pid, interval).start()
+                self.library.update(self.current_game)
+                self.save_games(self.current_game)
                 self.play_button.setText("ЗАПУЩЕНО")
                 self.play_button.setDisabled(True)
             except Exception as e:
                 QMessageBox.critical(self, "Ошибка запуска", f"Не удалось запустить игру: {e}")
                 self.current_game.process = None
 
-    def check_running_games(self):
-        for game in self.games:
-            if getattr(game, "process", None) and game.process.poll() is not None:
-                elapsed_time = time.time() - game.start_time
-                game.play_time += elapsed_time
-                game.process = None
-                game.start_time = None
-                self.save_games()
-
-                if self.current_game and self.current_game.exe_path == game.exe_path:
-                    self.play_button.setText("ИГРАТЬ")
-                    self.play_button.setEnabled(True)
-                    self.update_play_time_display()
-                
-                for i in range(self.games_list.count()):
-                    item = self.games_list.item(i)
-                    if item.data(Qt.UserRole).exe_path == game.exe_path:
-                        widget = self.games_list.itemWidget(item)
-                        if widget:
-                            widget.time_label.setText(widget.format_time(game.play_time))
-                        break
+    def on_game_exited(self, game, ended_at):
+        if game.start_time is not None:
+            game.play_time += max(0.0, ended_at - game.start_time)
+        game.process = None
+        game.start_time = None
+        if game.sampler is not None:
+            summary = game.sampler.stop()
+            game.sampler = None
+            if summary:
+                game.add_resource_session(summary)
+        self.running_games.pop(game.exe_path, None)
+        if not self.running_games:
+            self.heartbeat_timer.stop()
+        self.journal_event(self.journal.exit, game, ended_at)
+        self.save_games(game)
+        # Flush now rather than after the delay; once this batch is stored the
+        # journal can be compacted.
+        self.journal_checkpoint = self.library_writer.flush()
+
+        if self.current_game is game:
+            self.play_button.setText("ИГРАТЬ")
+            self.play_button.setEnabled(True)
+            self.update_play_time_display()
+
+        self.library.update(game)
+
+    def recover_sessions(self, games):
+        try:
+            totals = self.journal.replay()
+        except OSError as e:
+            self.on_save_failed(str(e))
+            return
+        if not totals:
+            return
+        recovered = []
+        for game in games:
+            if game.exe_path not in totals:
+                continue
+            play_time, last_played = totals[game.exe_path]
+            if play_time > (game.play_time or 0) or (last_played or 0) > (game.last_played or 0):
+                game.play_time = max(play_time, game.play_time or 0)
+                game.last_played = max(last_played or 0, game.last_played or 0) or None
+                recovered.append(game)
+        try:
+            # Stored synchronously: the journal may only be compacted once the
+            # recovered totals are in the library.
+            if recovered:
+                self.database.apply(records=[game.to_dict(include_text=False) for game in recovered])
+            self.journal.compact()
+        except Exception as e:
+            self.on_save_failed(str(e))
+
+    def journal_event(self, record, *args):
+        try:
+            record(*args)
+        except OSError as e:
+            self.on_save_failed(str(e))
+
+    def on_heartbeat(self):
+        self.journal_event(self.journal.heartbeat, list(self.running_games.values()))
+
+    def on_library_flushed(self, sequence):
+        if self.journal_checkpoint is not None and sequence >= self.journal_checkpoint:
+            self.journal_checkpoint = None
+            self.journal_event(self.journal.compact, list(self.running_games.values()))
 
     def edit_current_game(self):
         if not self.current_game:
@@ -457,14 +685,11 @@ class GameLauncher(QMainWindow):
         result = dialog.exec_()
         if result == QDialog.Accepted:
             if dialog.delete_requested:
-                self.delete_game_files(self.current_game)
-                try:
-                    self.games = [g for g in self.games if g.exe_path != self.current_game.exe_path]
-                except Exception:
-                    if self.current_game in self.games:
-                        self.games.remove(self.current_game)
+                game = self.current_game
+                self.library.remove(game)
+                self.delete_game_files(game)
+                self.library_writer.mark_removed(game)
                 self.current_game = None
-                self.populate_games_list()
                 self.update_ui_for_no_game()
             else:
                 new_name = dialog.name_edit.text().strip()
@@ -476,39 +701,32 @@ class GameLauncher(QMainWindow):
                     if resolved and os.path.exists(resolved) and resolved.lower().endswith('.exe'):
                         new_path = resolved
 
-                target = next((g for g in self.games if g.exe_path == self.current_game.exe_path), None)
+                target = self.library.get(self.current_game.exe_path)
                 if target:
+                    old_path = target.exe_path
+                    other = self.library.get(new_path) if new_path else None
+                    if other is not None and other is not target:
+                        QMessageBox.warning(self, "Редактирование игры", "Игра с этим исполняемым файлом уже есть в библиотеке.")
+                        new_path = ""
                     if new_name:
                         target.name = new_name
                     if new_path:
                         target.exe_path = new_path
                     target.description = new_desc
-
-                self.populate_games_list()
-                for i in range(self.games_list.count()):
-                    if self.games_list.item(i).data(Qt.UserRole).exe_path == (new_path or self.current_game.exe_path):
-                        self.games_list.setCurrentRow(i)
-                        break
-
-            self.save_games()
+                    target.is_favorite = dialog.favorite_check.isChecked()
+                    self.library.update(target, old_path)
+                    self.library_writer.mark_renamed(old_path, target)
+                    self.filter_games_list()
+                    self.select_game(target.exe_path)
 
     def delete_game_files(self, game):
-        try:
-            if getattr(game, "icon_path", None) and os.path.exists(game.icon_path):
-                os.remove(game.icon_path)
-        except Exception:
-            pass
-
-        try:
-            if getattr(game, "banner_path", None) and os.path.exists(game.banner_path):
-                os.remove(game.banner_path)
-        except Exception:
-            pass
+        others = [g for g in self.library if g is not game]
+        release_assets([game.icon_path, game.banner_path], others)
 
     def add_game_dialog(self):
         file_paths, _ = QFileDialog.getOpenFileNames(self, "Выберите исполняемые файлы игр или ярлыки", "", "Исполняемые файлы и ярлыки (*.exe *.lnk)")
         if file_paths:
-            added = False
+            added = []
             for file_path in file_paths:
                 if not file_path:
                     continue
@@ -524,17 +742,17 @@ class GameLauncher(QMainWindow):
                 if not resolved_path.lower().endswith('.exe'):
                     continue
 
-                if any(g.exe_path == resolved_path for g in self.games):
+                if resolved_path in self.library:
                     continue
                 game_name = os.path.splitext(os.path.basename(resolved_path))[0]
                 new_game = Game(game_name, resolved_path)
-                self.games.append(new_game)
-                added = True
+                self.library.add(new_game)
+                added.append(new_game)
             if added:
-                self.save_games()
-                self.populate_games_list()
-                if self.games_list.count() > 0:
-                    self.games_list.setCurrentRow(self.games_list.count()-1)
+                for game in added:
+                    self.save_games(game)
+                self.filter_games_list()
+                self.select_game(added[-1].exe_path)
 
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
@@ -546,7 +764,7 @@ class GameLauncher(QMainWindow):
 
     def dropEvent(self, event: QDropEvent):
         urls = event.mimeData().urls()
-        added = False
+        added = []
         for url in urls:
             file_path = url.toLocalFile()
             if not file_path:
@@ -560,33 +778,46 @@ class GameLauncher(QMainWindow):
                     continue
 
             if file_path.lower().endswith('.exe'):
-                if any(g.exe_path == file_path for g in self.games):
+                if file_path in self.library:
                     continue
                 game_name = os.path.splitext(os.path.basename(file_path))[0]
                 new_game = Game(game_name, file_path)
-                self.games.append(new_game)
-                added = True
+                self.library.add(new_game)
+                added.append(new_game)
         if added:
-            self.save_games()
-            self.populate_games_list()
+            for game in added:
+                self.save_games(game)
+            self.filter_games_list()
 
-    def save_games(self):
-        try:
-            with open('games.json', 'w', encoding='utf-8') as f:
-                json.dump([game.to_dict() for game in self.games], f, indent=4, ensure_ascii=False)
-        except Exception:
-            pass
+    def save_games(self, game=None):
+        # Workers can still report on a game that was removed meanwhile.
+        if game is not None and self.library.get(game.exe_path) is not game:
+            return
+        self.library_writer.mark_dirty(game)
 
     def load_games(self):
-        if os.path.exists('games.json'):
-            try:
-                with open('games.json', 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return [Game.from_dict(game_data) for game_data in data]
-            except Exception:
-                return []
-        return []
+        try:
+            self.database.migrate_json(GAMES_FILE)
+        except Exception as e:
+            QMessageBox.warning(self, "Миграция библиотеки", f"Не удалось перенести {GAMES_FILE}: {e}")
+        return self.database.load()
+
+    def on_save_failed(self, message):
+        if message != self.save_error:
+            self.save_error = message
+            QMessageBox.warning(self, "Ошибка сохранения", f"Не удалось сохранить библиотеку: {message}")
 
     def closeEvent(self, event):
-        self.save_games()
+        if self.metadata_prefetcher and self.metadata_prefetcher.isRunning():
+            # Cancelling ends the pipeline's rate-limit and backoff waits, so
+            # only requests already on the wire are left to finish.
+            self.metadata_prefetcher.cancel()
+            self.metadata_prefetcher.wait()
+        self.icon_pool.shutdown()
+        try:
+            self.library_writer.close()
+            self.journal.compact(list(self.running_games.values()))
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка сохранения", f"Не удалось сохранить библиотеку: {e}")
+        self.journal.close()
         event.accept()
@@ -0,0 +1,95 @@
+import os
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from game_search import GameSearchIndex
+from sort_index import SortIndexes
+
+
+def normalize_path(path):
+    return os.path.normcase(os.path.normpath(path)) if path else ""
+
+
+class GameLibrary(QObject):
+    game_added = pyqtSignal(object)
+    game_removed = pyqtSignal(object)
+    # Emitted with the game and its exe path before the change.
+    game_updated = pyqtSignal(object, str)
+
+    def __init__(self, games=(), parent=None):
+        super().__init__(parent)
+        self.by_path = {}
+        self.duplicates = []
+        for game in games:
+            key = normalize_path(game.exe_path)
+            if key in self.by_path:
+                self.duplicates.append(game)
+            else:
+                self.by_path[key] = game
+        self.search_index = GameSearchIndex(self.by_path.values())
+        self.sort_indexes = SortIndexes(self.by_path.values())
+
+    def __len__(self):
+        return len(self.by_path)
+
+    def __iter__(self):
+        return iter(list(self.by_path.values()))
+
+    def __contains__(self, exe_path):
+        return normalize_path(exe_path) in self.by_path
+
+    @property
+    def games(self):
+        return list(self.by_path.values())
+
+    def get(self, exe_path):
+        return self.by_path.get(normalize_path(exe_path))
+
+    def add(self, game):
+        key = normalize_path(game.exe_path)
+        if key in self.by_path:
+            return False
+        self.by_path[key] = game
+        self.search_index.add(game)
+        self.sort_indexes.add(game)
+        self.game_added.emit(game)
+        return True
+
+    def remove(self, game):
+        if self.by_path.get(normalize_path(game.exe_path)) is not game:
+            return False
+        del self.by_path[normalize_path(game.exe_path)]
+        self.search_index.remove(game.exe_path)
+        self.sort_indexes.remove(game.exe_path)
+        self.game_removed.emit(game)
+        return True
+
+    def update(self, game, old_exe_path=None):
+        # Call after mutating a game; pass the previous exe path if it changed.
+        old_exe_path = old_exe_path or game.exe_path
+        old_key, new_key = normalize_path(old_exe_path), normalize_path(game.exe_path)
+        if self.by_path.get(old_key) is not game:
+            return False
+        if old_key != new_key:
+            if new_key in self.by_path:
+                return False
+            self.by_path.pop(old_key, None)
+            self.by_path[new_key] = game
+        self.search_index.rename(old_exe_path, game)
+        self.sort_indexes.update(old_exe_path, game)
+        self.game_updated.emit(game, old_exe_path)
+        return True
+
+    def ordered(self, view, matches=None):
+        # With search scores, matches lead best first; ties and the games that
+        # did not match keep the view's order.
+        games = [self.by_path[normalize_path(exe_path)] for exe_path in self.sort_indexes[view].exe_paths()]
+        if matches:
+            games.sort(key=lambda game: matches.get(game.exe_path, 0.0), reverse=True)
+        return games
+
+    def position(self, view, game):
+        return self.sort_indexes[view].position(game.exe_path)
+
+    def search(self, text):
+        return self.search_index.search(text)
@@ -0,0 +1,143 @@
+import os
+import json
+import sqlite3
+import threading
+from functools import partial
+
+from game import Game
+
+DB_FILE = 'library.db'
+JSON_MIGRATED_KEY = 'json_migrated'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    exe_path TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    icon_path TEXT,
+    banner_path TEXT,
+    play_time REAL NOT NULL DEFAULT 0,
+    last_played REAL,
+    is_favorite INTEGER NOT NULL DEFAULT 0,
+    review_summary TEXT,
+    review_percentage INTEGER,
+    resource_sessions TEXT
+);
+CREATE INDEX IF NOT EXISTS games_name ON games (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS games_last_played ON games (last_played);
+CREATE INDEX IF NOT EXISTS games_favorite ON games (is_favorite);
+CREATE TABLE IF NOT EXISTS game_text (
+    game_id INTEGER PRIMARY KEY REFERENCES games (id) ON DELETE CASCADE,
+    description TEXT,
+    system_requirements TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+GAME_COLUMNS = (
+    'exe_path', 'name', 'icon_path', 'banner_path', 'play_time', 'last_played',
+    'is_favorite', 'review_summary', 'review_percentage', 'resource_sessions'
+)
+UPSERT_GAME = (
+    f"INSERT INTO games ({', '.join(GAME_COLUMNS)}) VALUES ({', '.join('?' * len(GAME_COLUMNS))}) "
+    f"ON CONFLICT (exe_path) DO UPDATE SET "
+    + ', '.join(f"{column} = excluded.{column}" for column in GAME_COLUMNS[1:])
+)
+UPSERT_TEXT = (
+    "INSERT INTO game_text (game_id, description, system_requirements) "
+    "SELECT id, ?, ? FROM games WHERE exe_path = ? "
+    "ON CONFLICT (game_id) DO UPDATE SET description = excluded.description, "
+    "system_requirements = excluded.system_requirements"
+)
+
+
+def game_row(record):
+    row = [record.get(column) for column in GAME_COLUMNS]
+    row[GAME_COLUMNS.index('play_time')] = record.get('play_time') or 0
+    row[GAME_COLUMNS.index('is_favorite')] = int(bool(record.get('is_favorite')))
+    sessions = record.get('resource_sessions')
+    row[GAME_COLUMNS.index('resource_sessions')] = json.dumps(sessions) if sessions else None
+    return row
+
+
+class LibraryDatabase:
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        # One connection shared by the GUI thread (loads, lazy text) and the
+        # writer thread, serialized by the lock.
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def meta(self, key):
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def migrate_json(self, json_path):
+        # One-shot: the JSON file is kept as a .migrated backup and never read again.
+        if self.meta(JSON_MIGRATED_KEY) or not os.path.exists(json_path):
+            return 0
+        with open(json_path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        with self.lock, self.connection:
+            self._upsert(records)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (JSON_MIGRATED_KEY, json_path)
+            )
+        os.replace(json_path, json_path + '.migrated')
+        return len(records)
+
+    def load(self):
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT id, {', '.join(GAME_COLUMNS)} FROM games ORDER BY id"
+            ).fetchall()
+        games = []
+        for game_id, *values in rows:
+            data = dict(zip(GAME_COLUMNS, values))
+            data['is_favorite'] = bool(data['is_favorite'])
+            data['resource_sessions'] = json.loads(data['resource_sessions']) if data['resource_sessions'] else None
+            game = Game.from_dict(data)
+            game.text_loader = partial(self.load_text, game_id)
+            games.append(game)
+        return games
+
+    def load_text(self, game_id):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT description, system_requirements FROM game_text WHERE game_id = ?", (game_id,)
+            ).fetchone()
+        return (row[0] or "", row[1]) if row else ("", None)
+
+    def _upsert(self, records):
+        self.connection.executemany(UPSERT_GAME, [game_row(record) for record in records])
+        self.connection.executemany(UPSERT_TEXT, [
+            (record.get('description') or "", record.get('system_requirements'), record['exe_path'])
+            for record in records if 'description' in record
+        ])
+
+    def apply(self, renames=(), removed=(), records=(), full=False):
+        with self.lock, self.connection:
+            # OR REPLACE: renaming onto a path another row already holds keeps the renamed game.
+            self.connection.executemany(
+                "UPDATE OR REPLACE games SET exe_path = ? WHERE exe_path = ?",
+                [(new_path, old_path) for old_path, new_path in renames]
+            )
+            self.connection.executemany("DELETE FROM games WHERE exe_path = ?", [(path,) for path in removed])
+            self._upsert(records)
+            if full:
+                kept = {record['exe_path'] for record in records}
+                stale = [(path,) for (path,) in self.connection.execute("SELECT exe_path FROM games")
+                         if path not in kept]
+                self.connection.executemany("DELETE FROM games WHERE exe_path = ?", stale)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
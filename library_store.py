@@ -0,0 +1,128 @@
+import threading
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+GAMES_FILE = 'games.json'
+FLUSH_DELAY = 2000
+
+
+class LibraryWriter(QObject):
+    save_failed = pyqtSignal(str)
+    flushed = pyqtSignal(int)
+    _write_failed = pyqtSignal(str)
+
+    def __init__(self, database, snapshot, delay=FLUSH_DELAY, parent=None):
+        super().__init__(parent)
+        self.database = database
+        self.snapshot = snapshot
+        self.dirty = {}
+        self.renames = []
+        self.removed = set()
+        self.dirty_all = False
+        self.writes = 0
+        self.sequence = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.flush)
+        self._write_failed.connect(self.on_write_failed)
+        self._pending = []
+        self._closed = False
+        self._failed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _schedule(self):
+        # The timer is not restarted by later events, so a steady stream of
+        # changes still reaches disk within one delay.
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def mark_dirty(self, game=None):
+        if game is None:
+            self.dirty_all = True
+        else:
+            self.dirty[game.exe_path] = game
+        self._schedule()
+
+    def mark_renamed(self, old_exe_path, game):
+        if old_exe_path != game.exe_path:
+            self.renames.append((old_exe_path, game.exe_path))
+            self.dirty.pop(old_exe_path, None)
+        self.mark_dirty(game)
+
+    def mark_removed(self, game):
+        self.dirty.pop(game.exe_path, None)
+        self.removed.add(game.exe_path)
+        self._schedule()
+
+    def is_dirty(self):
+        return self.dirty_all or bool(self.dirty or self.renames or self.removed)
+
+    def take_batch(self):
+        # Records are captured on the GUI thread, where games are mutated;
+        # the database work happens on the writer thread. Text columns are
+        # only written for games whose text has been loaded.
+        games = self.snapshot() if self.dirty_all else self.dirty.values()
+        batch = {
+            'renames': self.renames,
+            'removed': list(self.removed),
+            'records': [game.to_dict(include_text=game.text_loader is None) for game in games],
+            'full': self.dirty_all
+        }
+        self.dirty = {}
+        self.renames = []
+        self.removed = set()
+        self.dirty_all = False
+        return batch
+
+    def flush(self):
+        # Returns the sequence number that flushed() reports once everything
+        # marked so far is on disk.
+        self.timer.stop()
+        if not self.is_dirty():
+            return self.sequence
+        self.sequence += 1
+        batch = self.take_batch()
+        with self._condition:
+            self._pending.append((self.sequence, batch))
+            self._condition.notify()
+        return self.sequence
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                sequence, batch = self._pending.pop(0)
+            try:
+                self.write(batch)
+                self._failed = False
+                self.flushed.emit(sequence)
+            except Exception as e:
+                self._failed = True
+                self._write_failed.emit(str(e))
+
+    def write(self, batch):
+        self.database.apply(**batch)
+        self.writes += 1
+
+    def on_write_failed(self, message):
+        # A failed batch is lost, so the next flush resynchronizes every row.
+        self.mark_dirty()
+        self.save_failed.emit(message)
+
+    def close(self):
+        self.timer.stop()
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        if self._failed:
+            self.dirty_all = True
+        if self.is_dirty():
+            self.write(self.take_batch())
+        self.database.close()
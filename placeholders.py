@@ -0,0 +1,60 @@
+import threading
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPixmap, QPainter, QLinearGradient, QBrush, QColor, QFont, QGuiApplication
+
+_images = {}
+_pixmaps = {}
+_lock = threading.Lock()
+
+
+def placeholder_letter(name):
+    return name[0].upper() if name else "G"
+
+
+def render_placeholder(letter, size):
+    # QImage rather than QPixmap: painting on it is safe from worker threads.
+    image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.TextAntialiasing)
+    gradient = QLinearGradient(0, 0, size, size)
+    gradient.setColorAt(0, QColor("#333333"))
+    gradient.setColorAt(1, QColor("#1f1f1f"))
+    painter.setBrush(QBrush(gradient))
+    painter.setPen(Qt.NoPen)
+    painter.drawRoundedRect(0, 0, size, size, size / 6, size / 6)
+    font = QFont("Segoe UI")
+    font.setBold(True)
+    font.setPixelSize(max(1, round(size * 0.5)))
+    painter.setFont(font)
+    painter.setPen(QColor("#f0f4f6"))
+    painter.drawText(image.rect(), Qt.AlignCenter, letter)
+    painter.end()
+    return image
+
+
+def placeholder_image(name, size, dpr=1.0):
+    letter = placeholder_letter(name)
+    pixels = max(1, round(size * dpr))
+    key = (letter, pixels)
+    with _lock:
+        image = _images.get(key)
+        if image is None:
+            image = _images[key] = render_placeholder(letter, pixels)
+            image.setDevicePixelRatio(dpr)
+        return image
+
+
+def placeholder_pixmap(name, size, dpr=None):
+    # GUI thread only.
+    if dpr is None:
+        app = QGuiApplication.instance()
+        dpr = app.devicePixelRatio() if app is not None else 1.0
+    key = (placeholder_letter(name), max(1, round(size * dpr)))
+    pixmap = _pixmaps.get(key)
+    if pixmap is None:
+        pixmap = _pixmaps[key] = QPixmap.fromImage(placeholder_image(name, size, dpr))
+        pixmap.setDevicePixelRatio(dpr)
+    return pixmap
@@ -0,0 +1,195 @@
+import time
+import random
+import threading
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+
+HOST_RATES = {
+    'store.steampowered.com': (1.0, 20),
+    'api.steampowered.com': (5.0, 5),
+    'cdn.akamai.steamstatic.com': (20.0, 20),
+}
+DEFAULT_RATE = (5.0, 10)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TransientError(requests.exceptions.RequestException):
+    pass
+
+
+class RequestCancelled(TransientError):
+    pass
+
+
+_local = threading.local()
+
+
+@contextmanager
+def cancellable(event):
+    # Rate-limit and backoff waits on this thread end early, raising
+    # RequestCancelled, once the event is set.
+    previous = getattr(_local, 'cancelled', None)
+    _local.cancelled = event
+    try:
+        yield
+    finally:
+        _local.cancelled = previous
+
+
+def wait(delay):
+    event = getattr(_local, 'cancelled', None)
+    if event is None:
+        if delay > 0:
+            time.sleep(delay)
+    elif event.wait(max(0.0, delay)):
+        raise RequestCancelled("Request cancelled")
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.paused_until = 0.0
+        self.pauses = 0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        # Returns the delay until the reserved slot and the pause count it was
+        # reserved under.
+        with self.lock:
+            now = self.clock()
+            start = max(now, self.paused_until)
+            self.tokens = min(self.capacity, self.tokens + (start - self.updated) * self.rate)
+            self.updated = start
+            self.tokens -= 1
+            # Callers that find the bucket empty are given consecutive slots,
+            # so waiting requests go out in arrival order at exactly the rate.
+            if self.tokens >= 0:
+                return start - now, self.pauses
+            return start - now - self.tokens / self.rate, self.pauses
+
+    def acquire(self):
+        while True:
+            delay, pauses = self.reserve()
+            wait(delay)
+            # A pause that began while this caller waited voids its slot; it
+            # queues again behind the pause instead of sending into it.
+            with self.lock:
+                if self.pauses == pauses:
+                    return
+
+    def pause(self, delay):
+        with self.lock:
+            resume_at = self.clock() + delay
+            if resume_at > self.paused_until:
+                self.paused_until = resume_at
+                self.pauses += 1
+                # Slots reserved before the pause are taken again by their
+                # waiters, so their debt is dropped with them.
+                self.tokens = 0
+                self.updated = max(self.updated, resume_at)
+
+
+class RetryBudget:
+    def __init__(self, ratio=0.2, minimum=10):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.balance = float(minimum)
+        self.lock = threading.Lock()
+
+    def deposit(self):
+        with self.lock:
+            self.balance = min(self.balance + self.ratio, self.minimum + 100 * self.ratio)
+
+    def withdraw(self):
+        with self.lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+def retry_after_seconds(response):
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    def __init__(self, host_rates=HOST_RATES, default_rate=DEFAULT_RATE, max_attempts=5,
+                 base_delay=1.0, max_delay=120.0, budget=None, clock=time.monotonic):
+        self.host_rates = host_rates
+        self.default_rate = default_rate
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+        self.clock = clock
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.retries = 0
+        self.throttled = 0
+
+    def bucket_for(self, url):
+        host = urlsplit(url).hostname or ''
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                rate, capacity = self.host_rates.get(host, self.default_rate)
+                bucket = self.buckets[host] = TokenBucket(rate, capacity, self.clock)
+            return bucket
+
+    def backoff(self, attempt):
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def execute(self, url, send):
+        bucket = self.bucket_for(url)
+        for attempt in range(self.max_attempts):
+            bucket.acquire()
+            throttled = False
+            try:
+                response = send()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error, delay = e, self.backoff(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.budget.deposit()
+                    return response
+                error = TransientError(f"HTTP {response.status_code} for {url}", response=response)
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = self.backoff(attempt)
+                response.close()
+                if response.status_code == 429:
+                    # Throttling applies to the whole host: hold every queued
+                    # request back instead of only this one.
+                    throttled = True
+                    with self.lock:
+                        self.throttled += 1
+                    bucket.pause(min(delay, self.max_delay))
+
+            if attempt + 1 >= self.max_attempts or delay > self.max_delay or not self.budget.withdraw():
+                break
+            with self.lock:
+                self.retries += 1
+            if not throttled:
+                wait(delay)
+
+        if isinstance(error, TransientError):
+            raise error
+        raise TransientError(str(error))
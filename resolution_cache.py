@@ -0,0 +1,96 @@
+import os
+import json
+import time
+import threading
+
+from title_matcher import normalize_title
+
+RESOLUTION_FILE = 'steam_resolutions.json'
+NO_MATCH_TTL = 7 * 24 * 3600
+
+
+def resolution_key(game):
+    exe_name = os.path.basename(game.exe_path or "").lower()
+    return f"{normalize_title(game.name)}|{exe_name}"
+
+
+class ResolutionCache:
+    def __init__(self, path=RESOLUTION_FILE, no_match_ttl=NO_MATCH_TTL):
+        self.path = path
+        self.no_match_ttl = no_match_ttl
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.version = None
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    def _entry(self, game, version):
+        entry = self.entries.get(resolution_key(game))
+        if not entry or entry.get('version') != str(version):
+            return None
+        if entry.get('appid') is None and time.time() - entry.get('resolved_at', 0) > self.no_match_ttl:
+            return None
+        return entry
+
+    def lookup(self, game, version):
+        with self.lock:
+            entry = self._entry(game, version)
+        if entry is None:
+            return False, None
+        return True, entry.get('appid')
+
+    def is_no_match(self, game, version):
+        found, appid = self.lookup(game, version)
+        return found and appid is None
+
+    def store(self, game, appid, version):
+        # Only marks the cache dirty; callers save() once a batch of
+        # resolutions is done.
+        with self.lock:
+            self.entries[resolution_key(game)] = {
+                'appid': appid,
+                'version': str(version),
+                'resolved_at': time.time()
+            }
+            self.version = str(version)
+            self.dirty = True
+
+    def _prune(self, version):
+        stale = [key for key, entry in self.entries.items() if entry.get('version') != version]
+        for key in stale:
+            del self.entries[key]
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            self._prune(self.version)
+            data = json.dumps(self.entries, ensure_ascii=False)
+            self.dirty = False
+        try:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            with self.lock:
+                self.dirty = True
+
+
+_cache_lock = threading.Lock()
+_cache = None
+
+
+def get_resolution_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResolutionCache()
+        return _cache
@@ -0,0 +1,102 @@
+import os
+import json
+import time
+
+JOURNAL_FILE = 'sessions.journal'
+HEARTBEAT_INTERVAL = 60
+
+
+def encode_records(records):
+    return b''.join(json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n' for record in records)
+
+
+class SessionJournal:
+    # One JSON line per event: e=launch/beat/exit, p=exe path, t=timestamp,
+    # b=play time before the session (launch), n=play time after it (exit).
+    # Totals are absolute, so replaying a journal twice cannot double count.
+
+    def __init__(self, path=JOURNAL_FILE):
+        self.path = path
+        self.file = None
+        self.exits = 0
+
+    def _write(self, records):
+        if self.file is None:
+            self.file = open(self.path, 'a+b')
+            # Terminate a line torn by a crash so the next record parses.
+            if self.file.tell() > 0:
+                self.file.seek(-1, os.SEEK_END)
+                if self.file.read(1) != b'\n':
+                    self.file.write(b'\n')
+        self.file.write(encode_records(records))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    @staticmethod
+    def _launch_record(game):
+        return {'e': 'launch', 'p': game.exe_path, 't': game.start_time, 'b': game.play_time}
+
+    def launch(self, game):
+        self._write([self._launch_record(game)])
+
+    def heartbeat(self, games, now=None):
+        now = time.time() if now is None else now
+        records = [{'e': 'beat', 'p': game.exe_path, 't': now} for game in games]
+        if records:
+            self._write(records)
+
+    def exit(self, game, ended_at):
+        self._write([{'e': 'exit', 'p': game.exe_path, 't': ended_at, 'n': game.play_time}])
+        self.exits += 1
+
+    def replay(self):
+        # Returns {exe_path: (play_time, last_played)}. Sessions without an
+        # exit record are closed at their last heartbeat.
+        totals, sessions = {}, {}
+        try:
+            with open(self.path, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return totals
+        for line in lines:
+            try:
+                record = json.loads(line)
+                event, path, stamp = record['e'], record['p'], float(record['t'])
+            except (ValueError, KeyError, TypeError):
+                # A torn final line from a crash mid-write.
+                continue
+            if event == 'launch':
+                sessions[path] = [stamp, float(record.get('b') or 0), stamp]
+            elif event == 'beat' and path in sessions:
+                sessions[path][2] = stamp
+            elif event == 'exit':
+                sessions.pop(path, None)
+                total = float(record.get('n') or 0)
+                previous = totals.get(path, (0.0, None))
+                totals[path] = (max(previous[0], total), max(previous[1] or 0, stamp))
+        for path, (started, base, last) in sessions.items():
+            previous = totals.get(path, (0.0, None))
+            totals[path] = (max(previous[0], base + max(0.0, last - started)), max(previous[1] or 0, started))
+        return totals
+
+    def compact(self, running=()):
+        # Only call once every finished session's total is stored in the
+        # library; sessions still running are carried over.
+        self.close()
+        now = time.time()
+        records = []
+        for game in running:
+            records.append(self._launch_record(game))
+            records.append({'e': 'beat', 'p': game.exe_path, 't': now})
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(encode_records(records))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.exits = 0
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
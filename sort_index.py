@@ -0,0 +1,69 @@
+from bisect import bisect_left, insort
+
+SORT_NAME = 'name'
+SORT_RECENT = 'recent'
+SORT_PLAY_TIME = 'play_time'
+SORT_FAVORITES = 'favorites'
+
+# Every key ends with the exe path: it keeps keys unique, so bisect finds the
+# exact entry, and maps an entry back to its game.
+SORT_KEYS = {
+    SORT_NAME: lambda g: (g.name.casefold(), g.exe_path),
+    SORT_RECENT: lambda g: (-(g.last_played or 0), g.name.casefold(), g.exe_path),
+    SORT_PLAY_TIME: lambda g: (-(g.play_time or 0), g.name.casefold(), g.exe_path),
+    SORT_FAVORITES: lambda g: (not g.is_favorite, g.name.casefold(), g.exe_path),
+}
+
+
+class SortIndex:
+    def __init__(self, key, games=()):
+        self.key = key
+        self.keys = {game.exe_path: key(game) for game in games}
+        self.entries = sorted(self.keys.values())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def position(self, exe_path):
+        key = self.keys.get(exe_path)
+        return -1 if key is None else bisect_left(self.entries, key)
+
+    def add(self, game):
+        key = self.keys[game.exe_path] = self.key(game)
+        insort(self.entries, key)
+
+    def remove(self, exe_path):
+        key = self.keys.pop(exe_path, None)
+        if key is not None:
+            del self.entries[bisect_left(self.entries, key)]
+
+    def update(self, old_exe_path, game):
+        key = self.key(game)
+        if old_exe_path == game.exe_path and self.keys.get(old_exe_path) == key:
+            return False
+        self.remove(old_exe_path)
+        self.add(game)
+        return True
+
+    def exe_paths(self):
+        return [key[-1] for key in self.entries]
+
+
+class SortIndexes:
+    def __init__(self, games=(), keys=SORT_KEYS):
+        games = list(games)
+        self.indexes = {name: SortIndex(key, games) for name, key in keys.items()}
+
+    def __getitem__(self, name):
+        return self.indexes[name]
+
+    def add(self, game):
+        for index in self.indexes.values():
+            index.add(game)
+
+    def remove(self, exe_path):
+        for index in self.indexes.values():
+            index.remove(exe_path)
+
+    def update(self, old_exe_path, game):
+        return [name for name, index in self.indexes.items() if index.update(old_exe_path, game)]
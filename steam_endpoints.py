@@ -0,0 +1,42 @@
+import os
+
+API_BASE = "https://api.steampowered.com"
+STORE_BASE = "https://store.steampowered.com"
+CDN_BASE = "https://cdn.akamai.steamstatic.com"
+
+
+def configure(base_url=None, api_base=None, store_base=None, cdn_base=None):
+    global API_BASE, STORE_BASE, CDN_BASE
+    if base_url:
+        api_base = api_base or base_url
+        store_base = store_base or base_url
+        cdn_base = cdn_base or base_url
+    if api_base:
+        API_BASE = api_base.rstrip('/')
+    if store_base:
+        STORE_BASE = store_base.rstrip('/')
+    if cdn_base:
+        CDN_BASE = cdn_base.rstrip('/')
+
+
+def app_list_url():
+    return f"{API_BASE}/ISteamApps/GetAppList/v2/"
+
+
+def app_details_url(app_id):
+    return f"{STORE_BASE}/api/appdetails?appids={app_id}&l=russian"
+
+
+def app_reviews_url(app_id):
+    return f"{STORE_BASE}/appreviews/{app_id}?json=1&language=all&purchase_type=all&num_per_page=0"
+
+
+def store_page_url(app_id):
+    return f"{STORE_BASE}/app/{app_id}"
+
+
+def banner_url(app_id):
+    return f"{CDN_BASE}/steam/apps/{app_id}/header.jpg"
+
+
+configure(base_url=os.environ.get('LIBRELAUNCHER_STEAM_BASE_URL'))
@@ -0,0 +1,316 @@
+import os
+import re
+import html
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from bs4 import BeautifulSoup
+
+import http_client
+import steam_endpoints
+from request_scheduler import TransientError, cancellable
+from title_matcher import get_matcher, app_list_version
+from resolution_cache import get_resolution_cache
+from asset_store import BANNERS_DIR, CHUNK_SIZE, store_stream
+
+STORE_COOKIES = {'birthtime': '568022401', 'wants_mature_content': '1'}
+
+
+def missing_metadata(game):
+    missing = set()
+    if not (game.banner_path and os.path.exists(game.banner_path)):
+        missing.add('banner')
+    if not game.description or game.description == "Описание отсутствует.":
+        missing.add('description')
+    if not game.system_requirements:
+        missing.add('requirements')
+    if game.review_summary is None:
+        missing.add('reviews')
+    return missing
+
+
+def resolve_app_id(game, app_list):
+    if not app_list:
+        return None
+    resolutions = get_resolution_cache()
+    version = app_list_version(app_list)
+    found, app_id = resolutions.lookup(game, version)
+    if not found:
+        # An exact title is found in the store's sorted name table without
+        # building the fuzzy matcher, which holds the whole catalogue in memory.
+        find = getattr(app_list, 'find', None)
+        app_id = find(game.name) if find and game.name else None
+        if app_id is None:
+            matches = get_matcher(app_list).match(game.name, n=1, cutoff=0.6)
+            app_id = matches[0][1] if matches else None
+        resolutions.store(game, app_id, version)
+    return app_id
+
+
+def fetch_metadata(app_id, missing, banners_dir=BANNERS_DIR):
+    raw = {}
+    if 'reviews' in missing:
+        try:
+            raw['reviews'] = fetch_review_summary(app_id)
+        except TransientError:
+            pass
+
+    if 'banner' in missing:
+        raw['banner_path'] = download_banner(app_id, banners_dir)
+
+    if 'description' in missing or 'requirements' in missing:
+        try:
+            response = http_client.get(
+                steam_endpoints.app_details_url(app_id),
+                cacheable=has_json_body
+            )
+            if response.status_code == 200:
+                raw['details'] = response.json()
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+    return raw
+
+
+def has_json_body(response):
+    return response.content.strip() not in (b'', b'null')
+
+
+def download_banner(app_id, banners_dir=BANNERS_DIR):
+    try:
+        response = http_client.get(
+            steam_endpoints.banner_url(app_id),
+            stream=True, use_cache=False
+        )
+    except requests.exceptions.RequestException:
+        return None
+
+    try:
+        if response.status_code == 200 and 'image' in response.headers.get('Content-Type', ''):
+            return store_stream(banners_dir, response.iter_content(chunk_size=CHUNK_SIZE), '.jpg')
+    except (requests.exceptions.RequestException, OSError):
+        pass
+    finally:
+        response.close()
+    return None
+
+
+def fetch_review_summary(app_id):
+    try:
+        response = http_client.get(
+            steam_endpoints.app_reviews_url(app_id),
+            cacheable=has_json_body
+        )
+        if response.status_code == 200:
+            data = response.json()
+            if data.get('success') == 1 and 'query_summary' in data:
+                return parse_review_summary(data['query_summary'])
+    except TransientError:
+        raise
+    except (requests.exceptions.RequestException, ValueError, AttributeError):
+        pass
+    return fetch_store_page_reviews(app_id)
+
+
+def parse_review_summary(query_summary):
+    summary = query_summary.get('review_score_desc') or "N/A"
+    total = query_summary.get('total_reviews') or 0
+    percentage = None
+    if total:
+        percentage = round(100 * (query_summary.get('total_positive') or 0) / total)
+    return summary, percentage
+
+
+REVIEW_SUMMARY_RE = re.compile(r'<span class="game_review_summary[^"]*"[^>]*>([^<]*)<')
+REVIEW_TOOLTIP_RE = re.compile(r'<div class="user_reviews_summary_row"[^>]*?data-tooltip-text="([^"]*)"')
+
+
+def fetch_store_page_reviews(app_id):
+    try:
+        response = http_client.get(
+            steam_endpoints.store_page_url(app_id),
+            cookies=STORE_COOKIES, stream=True, use_cache=False
+        )
+    except TransientError:
+        raise
+    except requests.exceptions.RequestException:
+        return None, None
+
+    try:
+        if response.status_code != 200:
+            return None, None
+        return extract_store_page_reviews(response.iter_content(chunk_size=16384, decode_unicode=True))
+    except requests.exceptions.RequestException:
+        raise TransientError(f"Обрыв загрузки страницы приложения {app_id}")
+    finally:
+        response.close()
+
+
+def extract_store_page_reviews(chunks):
+    summary = None
+    percentage = None
+    tooltip_seen = False
+    buffer = ""
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode('utf-8', errors='replace')
+        buffer += chunk
+        if summary is None:
+            match = REVIEW_SUMMARY_RE.search(buffer)
+            if match:
+                summary = html.unescape(match.group(1)).strip()
+        if not tooltip_seen:
+            match = REVIEW_TOOLTIP_RE.search(buffer)
+            if match:
+                tooltip_seen = True
+                percent_match = re.search(r'(\d+)%', match.group(1))
+                if percent_match:
+                    percentage = int(percent_match.group(1))
+        if summary is not None and tooltip_seen:
+            break
+        # Keep only a tail large enough to hold a tag split across chunks.
+        buffer = buffer[-4096:]
+    return summary or "N/A", percentage
+
+
+def parse_requirements(requirements_html):
+    soup = BeautifulSoup(requirements_html, 'lxml')
+    for tag in soup.find_all(['ul', 'li']):
+        tag.replace_with(tag.get_text() + '\n')
+    return soup.get_text(separator='\n').strip()
+
+
+def apply_metadata(game, app_id, raw):
+    if 'reviews' in raw:
+        game.review_summary, game.review_percentage = raw['reviews']
+
+    if raw.get('banner_path'):
+        game.banner_path = raw['banner_path']
+
+    if raw.get('details'):
+        try:
+            app_data = raw['details'].get(str(app_id))
+            if app_data and app_data.get('success'):
+                game_data = app_data['data']
+
+                description_html = game_data.get('short_description', '')
+                game.description = re.sub(r'<.*?>', '', description_html).strip()
+
+                pc_requirements = game_data.get('pc_requirements', {})
+                if isinstance(pc_requirements, dict):
+                    requirements_html = pc_requirements.get('minimum', 'Системные требования не найдены.')
+                    game.system_requirements = parse_requirements(requirements_html)
+        except Exception:
+            pass
+
+
+def update_game_metadata(game, app_list, banners_dir=BANNERS_DIR):
+    missing = missing_metadata(game)
+    if not missing:
+        return False
+    app_id = resolve_app_id(game, app_list)
+    get_resolution_cache().save()
+    if not app_id:
+        return False
+    apply_metadata(game, app_id, fetch_metadata(app_id, missing, banners_dir))
+    return True
+
+
+class MetadataPipeline:
+    def __init__(self, app_list, workers=8, parse_workers=2, batch_size=25,
+                 on_progress=None, on_batch=None, banners_dir=BANNERS_DIR):
+        self.app_list = app_list
+        self.workers = workers
+        self.parse_workers = parse_workers
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+        self.on_batch = on_batch
+        self.banners_dir = banners_dir
+        self.cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._done = 0
+        self._total = 0
+        self._batch = []
+        self._queued = {}
+        self._started = {}
+        # Seconds each fetched game waited for a worker, and from pickup by a
+        # worker until it was finished.
+        self.queue_waits = []
+        self.latencies = []
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self, games):
+        games = list(games)
+        self._done = 0
+        self._total = len(games)
+        self._batch = []
+        self._report()
+
+        with ThreadPoolExecutor(self.parse_workers) as parse_pool, ThreadPoolExecutor(self.workers) as fetch_pool:
+            for game in games:
+                if self.cancelled.is_set():
+                    break
+                missing = missing_metadata(game)
+                app_id = resolve_app_id(game, self.app_list) if missing else None
+                if not app_id:
+                    self._finish(game, changed=False)
+                    continue
+                self._queued[id(game)] = time.perf_counter()
+                future = fetch_pool.submit(self._fetch, game, app_id, missing)
+                future.add_done_callback(
+                    lambda f, game=game, app_id=app_id: parse_pool.submit(self._parse, game, app_id, f)
+                )
+
+        self._flush()
+        get_resolution_cache().save()
+        return self._done
+
+    def _fetch(self, game, app_id, missing):
+        started = time.perf_counter()
+        with self._lock:
+            self.queue_waits.append(started - self._queued.pop(id(game), started))
+            self._started[id(game)] = started
+        if self.cancelled.is_set():
+            return None
+        with cancellable(self.cancelled):
+            return fetch_metadata(app_id, missing, self.banners_dir)
+
+    def _parse(self, game, app_id, future):
+        raw = None
+        try:
+            raw = future.result()
+        except Exception:
+            pass
+        if raw is not None and not self.cancelled.is_set():
+            apply_metadata(game, app_id, raw)
+            self._finish(game, changed=True)
+        else:
+            self._finish(game, changed=False)
+
+    def _finish(self, game, changed):
+        batch = None
+        with self._lock:
+            self._done += 1
+            started = self._started.pop(id(game), None)
+            if started is not None:
+                self.latencies.append(time.perf_counter() - started)
+            if changed:
+                self._batch.append(game)
+                if len(self._batch) >= self.batch_size:
+                    batch, self._batch = self._batch, []
+        if batch and self.on_batch:
+            self.on_batch(batch)
+        self._report()
+
+    def _flush(self):
+        with self._lock:
+            batch, self._batch = self._batch, []
+        if batch and self.on_batch:
+            self.on_batch(batch)
+
+    def _report(self):
+        if self.on_progress:
+            self.on_progress(self._done, self._total)
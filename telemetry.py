@@ -0,0 +1,172 @@
+import os
+import time
+import threading
+
+TELEMETRY_ENV = 'LIBRELAUNCHER_TELEMETRY_INTERVAL'
+PROC_DIR = '/proc'
+
+try:
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    CLOCK_TICKS, PAGE_SIZE = 100, 4096
+
+
+def sampling_interval():
+    # Telemetry is opt-in: set the variable to a sampling interval in seconds.
+    try:
+        interval = float(os.environ.get(TELEMETRY_ENV) or 0)
+    except ValueError:
+        return 0.0
+    if interval <= 0 or not os.path.isdir(os.path.join(PROC_DIR, 'self')):
+        return 0.0
+    return max(interval, 0.1)
+
+
+def read_stat(pid):
+    with open(f'{PROC_DIR}/{pid}/stat', 'rb') as f:
+        data = f.read()
+    # The command name may contain spaces and parentheses; fields after it are fixed.
+    fields = data[data.rindex(b')') + 2:].split()
+    ppid = int(fields[1])
+    ticks = int(fields[11]) + int(fields[12])
+    threads = int(fields[17])
+    rss = int(fields[21]) * PAGE_SIZE
+    return ppid, ticks, threads, rss
+
+
+def read_io(pid):
+    read_bytes = write_bytes = 0
+    try:
+        with open(f'{PROC_DIR}/{pid}/io', 'rb') as f:
+            for line in f:
+                if line.startswith(b'read_bytes:'):
+                    read_bytes = int(line.split()[1])
+                elif line.startswith(b'write_bytes:'):
+                    write_bytes = int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return read_bytes, write_bytes
+
+
+def children_files_supported():
+    # task/<tid>/children needs CONFIG_PROC_CHILDREN; the main thread's tid is the pid.
+    return os.path.exists(f'{PROC_DIR}/self/task/{os.getpid()}/children')
+
+
+class ResourceSampler:
+    def __init__(self, pid, interval):
+        self.pid = pid
+        self.interval = interval
+        self.started = time.time()
+        self.ticks = {}
+        self.io = {}
+        self.samples = 0
+        self.cpu_total = self.cpu_peak = 0.0
+        self.rss_total = self.rss_peak = 0
+        self.threads_total = self.threads_peak = 0
+        self.sampler_cpu = 0.0
+        self.use_children_files = children_files_supported()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._last = time.monotonic()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.summary()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+        self.sampler_cpu = time.thread_time()
+
+    def children(self, pid):
+        found = []
+        if self.use_children_files:
+            try:
+                tasks = os.listdir(f'{PROC_DIR}/{pid}/task')
+            except OSError:
+                return found
+            for task in tasks:
+                # A thread may exit between the listing and the read; its
+                # children are reparented to the remaining threads.
+                try:
+                    with open(f'{PROC_DIR}/{pid}/task/{task}/children', 'rb') as f:
+                        found.extend(int(child) for child in f.read().split())
+                except OSError:
+                    continue
+            return found
+        # Kernels without CONFIG_PROC_CHILDREN: scan every process's ppid.
+        for entry in os.listdir(PROC_DIR):
+            if entry.isdigit():
+                try:
+                    if read_stat(int(entry))[0] == pid:
+                        found.append(int(entry))
+                except (OSError, ValueError, IndexError):
+                    continue
+        return found
+
+    def process_tree(self):
+        pids, pending = [], [self.pid]
+        while pending:
+            pid = pending.pop()
+            pids.append(pid)
+            pending.extend(self.children(pid))
+        return pids
+
+    def sample(self):
+        now = time.monotonic()
+        elapsed, self._last = now - self._last, now
+        ticks = threads = rss = 0
+        alive = False
+        for pid in self.process_tree():
+            try:
+                _, pid_ticks, pid_threads, pid_rss = read_stat(pid)
+            except (OSError, ValueError, IndexError):
+                continue
+            alive = True
+            # Every process in the tree started after launch, so unseen pids count from zero.
+            ticks += max(0, pid_ticks - self.ticks.get(pid, 0))
+            self.ticks[pid] = pid_ticks
+            threads += pid_threads
+            rss += pid_rss
+            io = read_io(pid)
+            if io is not None:
+                self.io[pid] = io
+        if not alive or elapsed <= 0:
+            return
+
+        cpu = 100.0 * ticks / CLOCK_TICKS / elapsed
+        self.samples += 1
+        self.cpu_total += cpu
+        self.cpu_peak = max(self.cpu_peak, cpu)
+        self.rss_total += rss
+        self.rss_peak = max(self.rss_peak, rss)
+        self.threads_total += threads
+        self.threads_peak = max(self.threads_peak, threads)
+
+    def summary(self):
+        if not self.samples:
+            return None
+        duration = time.time() - self.started
+        return {
+            'started': self.started,
+            'duration': duration,
+            'interval': self.interval,
+            'samples': self.samples,
+            'processes': len(self.ticks),
+            'cpu_avg': round(self.cpu_total / self.samples, 1),
+            'cpu_peak': round(self.cpu_peak, 1),
+            'rss_avg': self.rss_total // self.samples,
+            'rss_peak': self.rss_peak,
+            'threads_avg': round(self.threads_total / self.samples, 1),
+            'threads_peak': self.threads_peak,
+            'io_read_bytes': sum(io[0] for io in self.io.values()),
+            'io_write_bytes': sum(io[1] for io in self.io.values()),
+            'sampler_cpu': round(100.0 * self.sampler_cpu / duration, 3) if duration > 0 else 0.0
+        }
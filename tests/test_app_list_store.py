@@ -0,0 +1,150 @@
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_steam import FakeSteamServer
+from app_list_store import delta_path, open_store, refresh_app_list
+import title_matcher
+from steam_metadata import resolve_app_id
+from title_matcher import get_matcher
+
+
+def catalogue(count, start=10):
+    return [{'appid': start + i, 'name': f"Test Game {start + i}"} for i in range(count)]
+
+
+def contents(path):
+    store = open_store(path)
+    try:
+        return {appid: name for name, appid in store}, len(store.overlay)
+    finally:
+        store.close()
+
+
+class RefreshAppListTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        # http_client keeps its response cache in the working directory.
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        self.server = FakeSteamServer().start()
+        self.addCleanup(self.server.stop)
+        self.path = os.path.join(self.tmp.name, 'steam_app_list.bin')
+        self.apps = catalogue(100)
+        self.server.set_apps(self.apps)
+
+    def refresh(self):
+        return refresh_app_list(self.path, self.server.app_list_url, force=True)
+
+    def test_unchanged_list_is_not_downloaded_again(self):
+        self.assertEqual(self.refresh()['status'], 'updated')
+        requests_before, sent_before = self.server.requests, self.server.bytes_sent
+
+        result = self.refresh()
+
+        self.assertEqual(result['status'], 'not_modified')
+        self.assertEqual(result['bytes_received'], 0)
+        self.assertEqual(self.server.requests - requests_before, 1)
+        self.assertEqual(self.server.bytes_sent, sent_before)
+        self.assertEqual(contents(self.path), ({app['appid']: app['name'] for app in self.apps}, 0))
+
+    def test_small_changes_are_appended_and_replayed(self):
+        self.refresh()
+        store = open_store(self.path)
+        self.addCleanup(store.close)
+        matcher = get_matcher(store)
+
+        self.apps[0] = {'appid': 10, 'name': "Renamed Game"}
+        self.apps.extend(catalogue(2, start=500))
+        self.server.set_apps(self.apps)
+        result = self.refresh()
+
+        self.assertEqual(result['status'], 'updated')
+        self.assertEqual(result['changed'], 3)
+        self.assertTrue(os.path.exists(delta_path(self.path)))
+        expected = {app['appid']: app['name'] for app in self.apps}
+        self.assertEqual(contents(self.path), (expected, 3))
+
+        updated = open_store(self.path)
+        self.addCleanup(updated.close)
+        self.assertIs(get_matcher(updated), matcher)
+        self.assertEqual(matcher.overlay_applied, 3)
+        self.assertEqual(matcher.match("Test Game 501")[0][1], 501)
+        self.assertEqual(matcher.match("Renamed Game")[0][1], 10)
+
+    def test_appid_renamed_twice_keeps_only_its_latest_name(self):
+        self.refresh()
+        store = open_store(self.path)
+        self.addCleanup(store.close)
+        matcher = get_matcher(store)
+
+        for name in ("First Rename", "Second Rename"):
+            self.apps[0] = {'appid': 10, 'name': name}
+            self.server.set_apps(self.apps)
+            self.refresh()
+
+        updated = open_store(self.path)
+        self.addCleanup(updated.close)
+        self.assertEqual(len(updated.overlay), 2)
+        self.assertEqual(len(updated), 100)
+        self.assertEqual([name for name, appid in updated if appid == 10], ["Second Rename"])
+
+        self.assertIs(get_matcher(updated), matcher)
+        self.assertEqual(len(matcher), 100)
+        self.assertIsNone(matcher.appid_for_name("Test Game 10"))
+        self.assertIsNone(matcher.appid_for_name("First Rename"))
+        self.assertEqual(matcher.appid_for_name("Second Rename"), 10)
+        self.assertNotIn("First Rename", [name for name, _, _ in matcher.match("First Rename", n=100)])
+        self.assertNotIn(10, [appid for _, appid, _ in matcher.match("Test Game 10", n=100)])
+
+    def test_find_looks_up_exact_names_in_base_and_overlay(self):
+        self.refresh()
+        self.apps[0] = {'appid': 10, 'name': "Renamed Game"}
+        self.apps.append({'appid': 500, 'name': "Brand New"})
+        self.server.set_apps(self.apps)
+        self.refresh()
+
+        store = open_store(self.path)
+        self.addCleanup(store.close)
+        self.assertEqual(store.find("Test Game 42"), 42)
+        self.assertEqual(store.find("Renamed Game"), 10)
+        self.assertEqual(store.find("Brand New"), 500)
+        self.assertIsNone(store.find("Test Game 10"))
+        self.assertIsNone(store.find("Test Game"))
+
+    def test_exact_title_resolves_without_building_the_matcher(self):
+        self.refresh()
+        store = open_store(self.path)
+        self.addCleanup(store.close)
+        title_matcher._matcher = None
+
+        game = SimpleNamespace(name="Test Game 42", exe_path="C:/Games/42/game.exe")
+        self.assertEqual(resolve_app_id(game, store), 42)
+        self.assertIsNone(title_matcher._matcher)
+
+    def test_large_changes_compact_the_store(self):
+        self.refresh()
+        self.apps.extend(catalogue(5, start=500))
+        self.server.set_apps(self.apps)
+        self.refresh()
+        self.assertTrue(os.path.exists(delta_path(self.path)))
+
+        # Ten more changes push the overlay past 10% of the base list.
+        self.apps.extend(catalogue(10, start=600))
+        self.server.set_apps(self.apps)
+        result = self.refresh()
+
+        self.assertEqual(result['changed'], 10)
+        self.assertFalse(os.path.exists(delta_path(self.path)))
+        self.assertEqual(contents(self.path), ({app['appid']: app['name'] for app in self.apps}, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
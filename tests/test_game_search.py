@@ -0,0 +1,73 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from game_search import GameSearchIndex
+
+
+def game(name):
+    return SimpleNamespace(name=name, exe_path=f"C:/Games/{name}/game.exe")
+
+
+NAMES = [
+    "Half-Life 2", "Portal", "Portal 2", "The Witcher 3: Wild Hunt", "Counter-Strike",
+    "Hollow Knight", "Stardew Valley", "Grand Theft Auto V", "Hades", "Hotline Miami",
+]
+
+
+class GameSearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.games = {name: game(name) for name in NAMES}
+        self.index = GameSearchIndex(self.games.values())
+
+    def names(self, text):
+        matches = self.index.search(text)
+        by_path = {g.exe_path: g.name for g in self.games.values()}
+        return [by_path[exe_path] for exe_path in sorted(matches, key=matches.get, reverse=True)]
+
+    def test_empty_query_disables_the_filter(self):
+        self.assertIsNone(self.index.search(""))
+        self.assertIsNone(self.index.search("  - "))
+
+    def test_tiers_rank_prefix_word_initials_substring_subsequence(self):
+        self.assertEqual(self.names("portal")[:2], ["Portal", "Portal 2"])
+        self.assertEqual(self.names("wild"), ["The Witcher 3: Wild Hunt"])
+        self.assertEqual(self.names("gtav"), ["Grand Theft Auto V"])
+        self.assertEqual(self.names("knig"), ["Hollow Knight"])
+
+        scores = self.index.search("h")
+        self.assertGreater(scores[self.games["Hades"].exe_path], scores[self.games["The Witcher 3: Wild Hunt"].exe_path])
+        self.assertIn(self.games["Hotline Miami"].exe_path, self.index.search("htlnm"))
+
+    def test_extending_a_query_narrows_like_a_fresh_search(self):
+        for query in ("h", "ho", "hol", "holl", "hollow k"):
+            narrowed = self.index.search(query)
+            self.assertEqual(narrowed, GameSearchIndex(self.games.values()).search(query))
+        self.assertEqual(list(narrowed), [self.games["Hollow Knight"].exe_path])
+
+    def test_no_match_returns_empty(self):
+        self.assertEqual(self.index.search("zzz"), {})
+        self.assertEqual(self.index.search("portalx"), {})
+
+    def test_add_remove_and_rename_update_results(self):
+        self.assertEqual(self.names("cele"), [])
+        celeste = game("Celeste")
+        self.index.add(celeste)
+        self.assertEqual(list(self.index.search("cele")), [celeste.exe_path])
+
+        self.index.search("port")
+        self.index.remove(self.games["Portal"].exe_path)
+        self.assertEqual(self.names("porta"), ["Portal 2"])
+
+        old_path = celeste.exe_path
+        celeste.name, celeste.exe_path = "Celeste Classic", "D:/celeste.exe"
+        self.index.rename(old_path, celeste)
+        self.assertEqual(list(self.index.search("celeste c")), ["D:/celeste.exe"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import sys
+import random
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import request_scheduler
+from request_scheduler import RequestScheduler, RetryBudget, TokenBucket, TransientError
+
+URL = 'https://store.steampowered.com/api/appdetails?appids=10'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.waits = []
+        self.on_wait = None
+
+    def __call__(self):
+        return self.now
+
+    def wait(self, delay):
+        # Stands in for request_scheduler.wait: time passes instantly.
+        self.waits.append(delay)
+        if self.on_wait is not None:
+            hook, self.on_wait = self.on_wait, None
+            hook()
+        self.now += max(0.0, delay)
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class SchedulerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(request_scheduler, 'wait', self.clock.wait)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TokenBucketTest(SchedulerTestCase):
+    def test_empty_bucket_hands_out_consecutive_slots(self):
+        bucket = TokenBucket(2.0, 1, self.clock)
+        delays = [bucket.reserve()[0] for _ in range(3)]
+        self.assertEqual(delays, [0.0, 0.5, 1.0])
+
+    def test_pause_delays_new_reservations(self):
+        bucket = TokenBucket(2.0, 1, self.clock)
+        bucket.pause(3.0)
+        bucket.acquire()
+        self.assertGreaterEqual(self.clock.now, 3.0)
+
+    def test_pause_holds_back_callers_already_waiting(self):
+        bucket = TokenBucket(2.0, 1, self.clock)
+        bucket.acquire()
+        self.clock.waits = []
+
+        # Another request gets a 429 while this caller waits for its slot.
+        def throttled():
+            self.clock.now = 0.1
+            bucket.pause(3.0)
+        self.clock.on_wait = throttled
+        bucket.acquire()
+
+        # The slot reserved at 0.5 s is given up and taken again after the pause.
+        self.assertEqual(self.clock.waits[0], 0.5)
+        self.assertEqual(len(self.clock.waits), 2)
+        self.assertGreaterEqual(self.clock.now, 3.1)
+
+    def test_shorter_pause_does_not_cut_a_longer_one(self):
+        bucket = TokenBucket(2.0, 1, self.clock)
+        bucket.pause(5.0)
+        bucket.pause(1.0)
+        self.assertEqual(bucket.paused_until, 5.0)
+
+
+class RequestSchedulerTest(SchedulerTestCase):
+    def scheduler(self, responses, **kwargs):
+        scheduler = RequestScheduler(clock=self.clock, **kwargs)
+        sent = []
+
+        def send():
+            sent.append(self.clock.now)
+            return responses.pop(0)
+        return scheduler, sent, send
+
+    def test_backoff_doubles_with_jitter_up_to_the_cap(self):
+        scheduler = RequestScheduler(base_delay=1.0, max_delay=8.0)
+        random.seed(1)
+        for attempt in range(6):
+            ceiling = min(8.0, 2.0 ** attempt)
+            for _ in range(20):
+                self.assertTrue(ceiling / 2 <= scheduler.backoff(attempt) <= ceiling)
+
+    def test_retry_after_pauses_the_host(self):
+        responses = [FakeResponse(429, {'Retry-After': '4'}), FakeResponse(200)]
+        scheduler, sent, send = self.scheduler(responses)
+
+        response = scheduler.execute(URL, send)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(scheduler.throttled, 1)
+        self.assertEqual(scheduler.retries, 1)
+        self.assertGreaterEqual(sent[1] - sent[0], 4.0)
+
+    def test_retries_stop_when_the_budget_is_spent(self):
+        responses = [FakeResponse(503) for _ in range(10)]
+        failed = list(responses)
+        scheduler, sent, send = self.scheduler(responses, budget=RetryBudget(ratio=0.2, minimum=2), max_attempts=5)
+
+        with self.assertRaises(TransientError):
+            scheduler.execute(URL, send)
+        self.assertEqual(len(sent), 3)
+        self.assertEqual(scheduler.retries, 2)
+        self.assertTrue(all(response.closed for response in failed[:3]))
+
+        # With the budget spent, the next failure is not retried at all.
+        with self.assertRaises(TransientError):
+            scheduler.execute(URL, send)
+        self.assertEqual(len(sent), 4)
+
+    def test_successes_refill_the_budget(self):
+        budget = RetryBudget(ratio=0.5, minimum=1)
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from session_journal import SessionJournal
+
+
+def running_game(exe_path, start_time, play_time):
+    return SimpleNamespace(exe_path=exe_path, start_time=start_time, play_time=play_time)
+
+
+class SessionJournalTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'sessions.journal')
+        self.journal = SessionJournal(self.path)
+        self.addCleanup(self.journal.close)
+
+    def test_finished_session_replays_its_total(self):
+        game = running_game('C:/Games/a.exe', 1000.0, 50.0)
+        self.journal.launch(game)
+        self.journal.heartbeat([game], now=1060.0)
+        game.play_time = 150.0
+        self.journal.exit(game, 1100.0)
+
+        expected = {'C:/Games/a.exe': (150.0, 1100.0)}
+        self.assertEqual(self.journal.replay(), expected)
+        # Totals are absolute, so replaying again does not add the session twice.
+        self.assertEqual(self.journal.replay(), expected)
+
+    def test_crashed_session_ends_at_last_heartbeat(self):
+        game = running_game('C:/Games/a.exe', 1000.0, 50.0)
+        self.journal.launch(game)
+        self.journal.heartbeat([game], now=1060.0)
+        self.journal.heartbeat([game], now=1120.0)
+
+        self.assertEqual(self.journal.replay(), {'C:/Games/a.exe': (170.0, 1000.0)})
+
+    def test_torn_line_is_skipped_and_terminated(self):
+        game = running_game('C:/Games/a.exe', 1000.0, 0.0)
+        self.journal.launch(game)
+        self.journal.close()
+        with open(self.path, 'ab') as f:
+            f.write(b'{"e":"exit","p":"C:/Ga')
+
+        game.play_time = 30.0
+        self.journal.exit(game, 1030.0)
+
+        self.assertEqual(self.journal.replay(), {'C:/Games/a.exe': (30.0, 1030.0)})
+
+    def test_compact_keeps_only_running_sessions(self):
+        finished = running_game('C:/Games/a.exe', 1000.0, 0.0)
+        started = time.time() - 60
+        running = running_game('C:/Games/b.exe', started, 40.0)
+        self.journal.launch(finished)
+        self.journal.launch(running)
+        finished.play_time = 100.0
+        self.journal.exit(finished, 1100.0)
+
+        self.journal.compact([running])
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual(len(f.read().splitlines()), 2)
+        totals = self.journal.replay()
+        self.assertEqual(set(totals), {'C:/Games/b.exe'})
+        play_time, last_played = totals['C:/Games/b.exe']
+        # Compaction carries the session over with a heartbeat at compaction time.
+        self.assertEqual(last_played, started)
+        self.assertAlmostEqual(play_time, 100.0, delta=5)
+        self.assertEqual(self.journal.exits, 0)
+
+        # The journal keeps accepting records after compaction.
+        running.play_time = 90.0
+        self.journal.exit(running, started + 50)
+        self.assertEqual(self.journal.replay(), {'C:/Games/b.exe': (90.0, started + 50)})
+
+
+if __name__ == '__main__':
+    unittest.main()
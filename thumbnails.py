@@ -0,0 +1,83 @@
+import os
+import tempfile
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QImageReader
+
+from asset_store import ICONS_DIR, THUMBS_SUBDIR, TMP_PREFIX, is_managed, path_key
+
+# Banners get one thumbnail per source, scaled by height alone (a zero width);
+# the launcher scales and crops it to cover the label when it is shown.
+BANNER_HEIGHT = 240
+BANNER_THUMBNAIL = (0, BANNER_HEIGHT, Qt.KeepAspectRatioByExpanding)
+ICON_THUMBNAIL = (48, 48, Qt.KeepAspectRatio)
+
+
+def size_tag(width, height, mode=Qt.KeepAspectRatio):
+    suffix = "fill" if mode == Qt.KeepAspectRatioByExpanding else "fit"
+    return f"{width}x{height}_{suffix}"
+
+
+# The sizes the list and the banner request; thumbnails of any other size are
+# left over from older layouts and get garbage collected.
+THUMBNAIL_TAGS = frozenset(size_tag(*size) for size in (ICON_THUMBNAIL, BANNER_THUMBNAIL))
+
+
+def thumbnail_dir(source):
+    if is_managed(source):
+        return os.path.join(os.path.dirname(source), THUMBS_SUBDIR)
+    return os.path.join(ICONS_DIR, THUMBS_SUBDIR)
+
+
+def thumbnail_path(source, width, height, dpr=1.0, mode=Qt.KeepAspectRatio):
+    name = f"{path_key(source)}_{size_tag(width, height, mode)}@{dpr:g}x.png"
+    return os.path.join(thumbnail_dir(source), name)
+
+
+def scaled_size(size, width, height, dpr=1.0, mode=Qt.KeepAspectRatio):
+    # Returns None when the target is not smaller than the source: thumbnails
+    # are never upscaled.
+    target = size.scaled(round(width * dpr), round(height * dpr), mode)
+    if target.width() >= size.width() or target.height() >= size.height():
+        return None
+    return target
+
+
+def ensure_thumbnail(source, width, height, dpr=1.0, mode=Qt.KeepAspectRatio):
+    try:
+        source_mtime = os.stat(source).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+    path = thumbnail_path(source, width, height, dpr, mode)
+    try:
+        if os.stat(path).st_mtime_ns >= source_mtime:
+            return path
+    except OSError:
+        pass
+
+    # Only the header is read to decide; a source already small enough is
+    # used as is.
+    size = QImageReader(source).size()
+    if not size.isValid():
+        return None
+    target = scaled_size(size, width, height, dpr, mode)
+    if target is None:
+        return source
+    image = QImage(source)
+    if image.isNull():
+        return None
+    image = image.scaled(target, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=TMP_PREFIX, suffix=".png", dir=directory)
+    os.close(fd)
+    try:
+        if not image.save(tmp_path, "PNG"):
+            return None
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
@@ -0,0 +1,162 @@
+import re
+import math
+import heapq
+import difflib
+import threading
+from array import array
+from collections import Counter
+
+
+def normalize_title(name):
+    name = re.sub(r'[\W_]+', ' ', (name or "").casefold())
+    return ' '.join(name.split())
+
+
+def title_trigrams(normalized):
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleMatcher:
+    trigram_cutoff = 0.3
+
+    def __init__(self, apps=(), version=None, base_version=None):
+        self.version = version
+        self.base_version = base_version
+        self.overlay_applied = 0
+        self.names = []
+        self.normalized = []
+        self.appids = array('I')
+        self.trigram_counts = array('H')
+        self.name_to_appid = {}
+        self.exact = {}
+        self.postings = {}
+        # Indexes of entries replaced by a later delta; postings still list
+        # them, so match() skips them.
+        self.removed = set()
+        self.add(apps)
+
+    def add(self, apps):
+        postings = self.postings
+        for app in apps:
+            name, appid = self._unpack(app)
+            if not name or appid is None:
+                continue
+            if name in self.name_to_appid:
+                continue
+            self.name_to_appid[name] = appid
+
+            normalized = normalize_title(name)
+            grams = title_trigrams(normalized)
+            index = len(self.names)
+            self.names.append(name)
+            self.normalized.append(normalized)
+            self.appids.append(appid)
+            self.trigram_counts.append(min(len(grams), 0xFFFF))
+            self.exact.setdefault(normalized, index)
+
+            for gram in grams:
+                bucket = postings.get(gram)
+                if bucket is None:
+                    postings[gram] = bucket = array('I')
+                bucket.append(index)
+
+    def apply(self, apps):
+        # Delta entries rename or add apps: the last name wins, and the
+        # previous entry of each appid stops matching.
+        latest = {}
+        for app in apps:
+            name, appid = self._unpack(app)
+            if appid is not None:
+                latest[appid] = name
+        for index, appid in enumerate(self.appids):
+            if appid in latest and index not in self.removed:
+                self._remove(index)
+        self.add((name, appid) for appid, name in latest.items())
+
+    def _remove(self, index):
+        self.removed.add(index)
+        name, normalized = self.names[index], self.normalized[index]
+        if self.name_to_appid.get(name) == self.appids[index]:
+            del self.name_to_appid[name]
+        if self.exact.get(normalized) == index:
+            del self.exact[normalized]
+
+    @staticmethod
+    def _unpack(app):
+        if isinstance(app, dict):
+            return app.get('name'), app.get('appid')
+        return app[0], app[1]
+
+    def __len__(self):
+        return len(self.names) - len(self.removed)
+
+    def appid_for_name(self, name):
+        return self.name_to_appid.get(name)
+
+    def match(self, title, n=1, cutoff=0.6, candidates=64):
+        query = normalize_title(title)
+        if not query or not self.names:
+            return []
+
+        query_grams = title_trigrams(query)
+        query_size = len(query_grams)
+        # A title scoring above the cutoff shares a minimum number of trigrams
+        # with the query, so it must contain one of the rarest ones; counting
+        # only those keeps the very common trigrams out of the hot loop.
+        required = max(1, math.ceil(self.trigram_cutoff * query_size / (2.0 - self.trigram_cutoff)))
+        grams = sorted(query_grams, key=lambda gram: len(self.postings.get(gram, ())))
+        counts = Counter()
+        for gram in grams[:query_size - required + 1]:
+            ids = self.postings.get(gram)
+            if ids is not None:
+                counts.update(ids)
+        for index in self.removed:
+            counts.pop(index, None)
+
+        pool = heapq.nlargest(
+            candidates,
+            counts.most_common(candidates * 4),
+            key=lambda item: 2.0 * item[1] / (query_size + self.trigram_counts[item[0]])
+        )
+        pool_ids = {index for index, _ in pool}
+        if query in self.exact:
+            pool_ids.add(self.exact[query])
+
+        scorer = difflib.SequenceMatcher()
+        scorer.set_seq2(query)
+        ranked = []
+        for index in pool_ids:
+            scorer.set_seq1(self.normalized[index])
+            if scorer.real_quick_ratio() < cutoff or scorer.quick_ratio() < cutoff:
+                continue
+            score = scorer.ratio()
+            if score >= cutoff:
+                ranked.append((score, -index))
+
+        ranked = heapq.nlargest(n, ranked)
+        return [(self.names[-neg], self.appids[-neg], score) for score, neg in ranked]
+
+
+_matcher_lock = threading.Lock()
+_matcher = None
+
+
+def app_list_version(app_list):
+    return getattr(app_list, 'version', None) or (id(app_list), len(app_list))
+
+
+def get_matcher(app_list):
+    global _matcher
+    version = app_list_version(app_list)
+    base_version = getattr(app_list, 'base_version', None)
+    with _matcher_lock:
+        if _matcher is not None and _matcher.version != version and base_version is not None \
+                and _matcher.base_version == base_version and len(app_list.overlay) >= _matcher.overlay_applied:
+            _matcher.apply(app_list.overlay[_matcher.overlay_applied:])
+            _matcher.overlay_applied = len(app_list.overlay)
+            _matcher.version = version
+        elif _matcher is None or _matcher.version != version:
+            _matcher = TitleMatcher(app_list, version=version, base_version=base_version)
+            _matcher.overlay_applied = len(getattr(app_list, 'overlay', ()))
+        return _matcher
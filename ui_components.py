@@ -1,80 +1,174 @@
-import os
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton, QLineEdit, QGraphicsDropShadowEffect
+    QWidget, QHBoxLayout, QLabel, QPushButton, QLineEdit,
+    QStyledItemDelegate, QStyle
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap, QPainter, QLinearGradient, QBrush, QColor, QFont
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QSizeF, QRect, QRectF, QPointF
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter
+from image_cache import get_pixmap_cache
+from placeholders import placeholder_pixmap
 
 
-class GameListItem(QWidget):
-    def __init__(self, game, parent=None):
-        super().__init__(parent)
-        self.game = game
-        self.setFixedHeight(56)
+GAME_ROLE = Qt.UserRole
+ROW_HEIGHT = 64
+ICON_SIZE = 48
 
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(10, 6, 10, 6)
-        layout.setSpacing(10)
-
-        self.icon_label = QLabel()
-        self.icon_label.setFixedSize(48, 48)
-        self.icon_label.setStyleSheet("border-radius:8px;")
-        self.load_icon()
-
-        # drop shadow effect (QGraphicsDropShadowEffect is in QtWidgets)
-        effect = QGraphicsDropShadowEffect(self.icon_label)
-        effect.setBlurRadius(10)
-        effect.setXOffset(0)
-        effect.setYOffset(1)
-        effect.setColor(QColor(0, 0, 0, 140))
-        self.icon_label.setGraphicsEffect(effect)
-
-        layout.addWidget(self.icon_label)
-
-        name_layout = QVBoxLayout()
-        name_layout.setContentsMargins(0, 0, 0, 0)
-        name_layout.setSpacing(1)
-
-        self.name_label = QLabel(game.name)
-        self.name_label.setStyleSheet("QLabel { color: #eef2f4; font-size: 13px; font-weight: 600; }")
-        name_layout.addWidget(self.name_label)
-
-        self.time_label = QLabel(self.format_time(game.play_time))
-        self.time_label.setStyleSheet("QLabel { color: #aab1b6; font-size: 11px; }")
-        name_layout.addWidget(self.time_label)
-
-        layout.addLayout(name_layout, 1)
-
-    def format_time(self, seconds):
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        return f"{hours}ч {minutes}м"
-
-    def load_icon(self):
-        pixmap = QPixmap()
-        if getattr(self.game, "icon_path", None) and os.path.exists(self.game.icon_path):
-            pixmap.load(self.game.icon_path)
-
-        if pixmap.isNull():
-            pixmap = QPixmap(48, 48)
-            pixmap.fill(Qt.transparent)
-
-            painter = QPainter(pixmap)
-            gradient = QLinearGradient(0, 0, 48, 48)
-            gradient.setColorAt(0, QColor("#333333"))
-            gradient.setColorAt(1, QColor("#222222"))
-            painter.setBrush(QBrush(gradient))
-            painter.setPen(Qt.NoPen)
-            painter.drawRoundedRect(0, 0, 48, 48, 8, 8)
 
-            font = QFont("Segoe UI", 18, QFont.Bold)
-            painter.setFont(font)
-            painter.setPen(QColor("#f2f5f6"))
-            painter.drawText(pixmap.rect(), Qt.AlignCenter, (self.game.name[0].upper() if self.game.name else "G"))
-            painter.end()
+def format_play_time(seconds):
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    return f"{hours}ч {minutes}м"
 
-        self.icon_label.setPixmap(pixmap.scaled(48, 48, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+
+class GameListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.games = []
+        self.rows = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.games)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        game = self.games[index.row()]
+        if role == Qt.DisplayRole:
+            return game.name
+        if role == GAME_ROLE:
+            return game
+        return None
+
+    def set_games(self, games):
+        self.beginResetModel()
+        self.games = list(games)
+        self.rows = {game.exe_path: row for row, game in enumerate(self.games)}
+        self.endResetModel()
+
+    def set_order(self, games):
+        # Reorders in place: persistent indexes (selection, hidden rows)
+        # follow their games instead of being reset.
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        moved = [(self.games[index.row()], index.column()) for index in persistent]
+        self.games = list(games)
+        self.rows = {game.exe_path: row for row, game in enumerate(self.games)}
+        self.changePersistentIndexList(
+            persistent, [self.index(self.rows.get(game.exe_path, -1), column) for game, column in moved]
+        )
+        self.layoutChanged.emit()
+
+    def _reindex(self, start, end=None):
+        for row in range(start, len(self.games) if end is None else end):
+            self.rows[self.games[row].exe_path] = row
+
+    def insert_game(self, row, game):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.games.insert(row, game)
+        self._reindex(row)
+        self.endInsertRows()
+
+    def remove_game(self, exe_path):
+        row = self.rows.get(exe_path)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.games[row]
+        del self.rows[exe_path]
+        self._reindex(row)
+        self.endRemoveRows()
+
+    def move_game(self, old_exe_path, row):
+        current = self.rows.pop(old_exe_path, None)
+        if current is None:
+            return
+        game = self.games[current]
+        if row != current:
+            self.beginMoveRows(QModelIndex(), current, current, QModelIndex(), row + 1 if row > current else row)
+            del self.games[current]
+            self.games.insert(row, game)
+            self._reindex(min(row, current), max(row, current) + 1)
+            self.endMoveRows()
+        else:
+            self.rows[game.exe_path] = current
+        self.refresh(game)
+
+    def game_at(self, row):
+        return self.games[row] if 0 <= row < len(self.games) else None
+
+    def row_of(self, exe_path):
+        return self.rows.get(exe_path, -1)
+
+    def refresh(self, game):
+        row = self.rows.get(game.exe_path)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+
+class GameItemDelegate(QStyledItemDelegate):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = QFont()
+        self.name_font.setPixelSize(13)
+        self.name_font.setWeight(QFont.DemiBold)
+        self.time_font = QFont()
+        self.time_font.setPixelSize(11)
+        self.name_color = QColor("#eef2f4")
+        self.time_color = QColor("#aab1b6")
+        self.selected_color = QColor(255, 255, 255, 10)
+        self.hover_color = QColor(255, 255, 255, 8)
+        self.name_metrics = QFontMetrics(self.name_font)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def icon_for(self, game, dpr):
+        # Only rows whose icon job has finished read from disk; the rest show
+        # the shared placeholder until their thumbnail exists. The launcher
+        # caches each finished icon under the same size and ratio.
+        pixmap = None
+        if game.icon_loaded:
+            pixmap = get_pixmap_cache().get(game.icon_path, ICON_SIZE, ICON_SIZE, dpr=dpr)
+        return pixmap or placeholder_pixmap(game.name, ICON_SIZE)
+
+    def paint(self, painter, option, index):
+        game = index.data(GAME_ROLE)
+        if game is None:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        card = QRectF(option.rect.adjusted(0, 4, 0, -4))
+
+        if option.state & QStyle.State_Selected:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.selected_color)
+            painter.drawRoundedRect(card, 8, 8)
+        elif option.state & QStyle.State_MouseOver:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.hover_color)
+            painter.drawRoundedRect(card, 8, 8)
+
+        icon_rect = QRect(int(card.left()) + 10, int(card.center().y()) - ICON_SIZE // 2, ICON_SIZE, ICON_SIZE)
+        pixmap = self.icon_for(game, painter.device().devicePixelRatioF())
+        # Non-square icons keep their aspect ratio, centered in the icon square.
+        size = QSizeF(pixmap.size()) / pixmap.devicePixelRatioF()
+        target = QRectF(QPointF(0, 0), size.scaled(QSizeF(icon_rect.size()), Qt.KeepAspectRatio))
+        target.moveCenter(QRectF(icon_rect).center())
+        painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+
+        text_left = icon_rect.right() + 11
+        text_width = max(0, int(card.right()) - 10 - text_left)
+        name_rect = QRect(text_left, icon_rect.top() + 6, text_width, 18)
+        time_rect = QRect(text_left, name_rect.bottom() + 2, text_width, 16)
+
+        painter.setFont(self.name_font)
+        painter.setPen(self.name_color)
+        name = self.name_metrics.elidedText(game.name, Qt.ElideRight, text_width)
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignVCenter, name)
+        painter.setFont(self.time_font)
+        painter.setPen(self.time_color)
+        painter.drawText(time_rect, Qt.AlignLeft | Qt.AlignVCenter, format_play_time(game.play_time))
+        painter.restore()
 
 
 class CustomTitleBar(QWidget):
@@ -1,30 +1,35 @@
 import os
-import json
 import time
-import re
-import difflib
-import requests
-from bs4 import BeautifulSoup
-from PyQt5.QtCore import QThread, pyqtSignal, Qt
-from PyQt5.QtGui import QPixmap, QPainter, QLinearGradient, QBrush, QColor, QFont
+import threading
+from PyQt5.QtCore import QThread, QThreadPool, QRunnable, QObject, QTimer, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader
 from icoextract import IconExtractor
+from steam_metadata import missing_metadata, update_game_metadata, MetadataPipeline
+import steam_endpoints
+from asset_store import ICONS_DIR, temp_path, store_file
+from thumbnails import ensure_thumbnail
+from placeholders import placeholder_image
+from icon_manifest import get_icon_manifest, STATUS_ICON, STATUS_NO_ICON
+from app_list_store import STORE_FILE, open_store, refresh_app_list
+
+LIST_ICON_SIZE = 48
 
 class SteamAppListLoader(QThread):
-    list_loaded = pyqtSignal(list)
+    list_loaded = pyqtSignal(object)
+
+    def __init__(self, force=False, parent=None):
+        super().__init__(parent)
+        self.force = force
 
     def run(self):
         try:
-            response = requests.get("https://api.steampowered.com/ISteamApps/GetAppList/v2/", timeout=15)
-            if response.status_code == 200:
-                data = response.json()
-                apps = data.get("applist", {}).get("apps", [])
-                with open('steam_app_list.json', 'w', encoding='utf-8') as f:
-                    json.dump(apps, f, indent=4, ensure_ascii=False)
-                self.list_loaded.emit(apps)
+            result = refresh_app_list(STORE_FILE, steam_endpoints.app_list_url(), force=self.force)
+            if result['status'] == 'updated':
+                self.list_loaded.emit(open_store(STORE_FILE))
             else:
-                self.list_loaded.emit([])
+                self.list_loaded.emit(None)
         except Exception:
-            self.list_loaded.emit([])
+            self.list_loaded.emit(None)
 
 class SteamDetailsDownloader(QThread):
     details_processed = pyqtSignal(object)
@@ -33,174 +38,168 @@ class SteamDetailsDownloader(QThread):
         super().__init__(parent)
         self.game = game
         self.steam_app_list = steam_app_list
-        self.banners_dir = "game_banners"
-        os.makedirs(self.banners_dir, exist_ok=True)
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
-    def _fetch_steam_reviews(self, app_id):
-        try:
-            url = f"https://store.steampowered.com/app/{app_id}"
-            cookies = {'birthtime': '568022401', 'wants_mature_content': '1'}
-            response = requests.get(url, headers=self.headers, cookies=cookies, timeout=10)
-
-            if response.status_code != 200:
-                return None, None
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            summary_element = soup.find('span', class_='game_review_summary')
-            tooltip_element = soup.find('div', class_='user_reviews_summary_row')
-            
-            summary = "N/A"
-            percentage = None
-
-            if summary_element:
-                summary = summary_element.get_text(strip=True)
-
-            if tooltip_element and 'data-tooltip-text' in tooltip_element.attrs:
-                tooltip_text = tooltip_element['data-tooltip-text']
-                match = re.search(r'(\d+)%', tooltip_text)
-                if match:
-                    percentage = int(match.group(1))
-            
-            return summary, percentage
-
-        except requests.exceptions.RequestException:
-            return None, None
-        except Exception:
-            return None, None
 
     def run(self):
-        has_banner = self.game.banner_path and os.path.exists(self.game.banner_path)
-        has_description = self.game.description and self.game.description != "Описание отсутствует."
-        has_sys_req = self.game.system_requirements
-        has_reviews = self.game.review_summary is not None
-
-        if has_banner and has_description and has_sys_req and has_reviews:
+        if not missing_metadata(self.game):
             return
+        update_game_metadata(self.game, self.steam_app_list)
+        self.details_processed.emit(self.game)
 
-        if not self.steam_app_list:
-            self.details_processed.emit(self.game)
-            return
+class ProcessWatcher(QObject):
+    process_exited = pyqtSignal(object, float)
 
-        game_name = self.game.name
-        all_app_names = [app['name'] for app in self.steam_app_list]
-        matches = difflib.get_close_matches(game_name, all_app_names, n=1, cutoff=0.6)
+    def watch(self, game, process):
+        # One blocked waiter per running game: nothing wakes up until the
+        # process exits, and the exit time is taken the moment wait() returns.
+        # Daemon threads let the launcher close while games keep running.
+        thread = threading.Thread(target=self._wait, args=(game, process), daemon=True)
+        thread.start()
 
-        if not matches:
-            self.details_processed.emit(self.game)
-            return
+    def _wait(self, game, process):
+        try:
+            process.wait()
+        except Exception:
+            pass
+        self.process_exited.emit(game, time.time())
 
-        best_match_name = matches[0]
-        app_id = next((app['appid'] for app in self.steam_app_list if app['name'] == best_match_name), None)
-        
-        if not app_id:
-            self.details_processed.emit(self.game)
-            return
-        
-        if not has_reviews:
-            summary, percentage = self._fetch_steam_reviews(app_id)
-            self.game.review_summary = summary
-            self.game.review_percentage = percentage
+class MetadataPrefetcher(QThread):
+    progress = pyqtSignal(int, int)
+    batch_processed = pyqtSignal(list)
 
-        if not has_banner:
-            try:
-                banner_url = f"https://cdn.akamai.steamstatic.com/steam/apps/{app_id}/header.jpg"
-                response = requests.get(banner_url, timeout=10)
-                if response.status_code == 200 and 'image' in response.headers.get('Content-Type', ''):
-                    safe_name = re.sub(r'[^\w]', '', self.game.name)[:30]
-                    banner_path = os.path.join(self.banners_dir, f"{safe_name}.jpg")
-                    with open(banner_path, 'wb') as f:
-                        f.write(response.content)
-                    self.game.banner_path = banner_path
-            except Exception:
-                pass
-
-        if not has_description or not has_sys_req:
-            try:
-                details_url = f"https://store.steampowered.com/api/appdetails?appids={app_id}&l=russian"
-                response = requests.get(details_url, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    app_data = data.get(str(app_id))
-                    if app_data and app_data.get('success'):
-                        game_data = app_data['data']
-                        
-                        description_html = game_data.get('short_description', '')
-                        self.game.description = re.sub(r'<.*?>', '', description_html).strip()
-                        
-                        pc_requirements = game_data.get('pc_requirements', {})
-                        if isinstance(pc_requirements, dict):
-                            requirements_html = pc_requirements.get('minimum', 'Системные требования не найдены.')
-                            soup = BeautifulSoup(requirements_html, 'html.parser')
-                            for tag in soup.find_all(['ul', 'li']):
-                                tag.replace_with(tag.get_text() + '\n')
-                            self.game.system_requirements = soup.get_text(separator='\n').strip()
-            except Exception:
-                pass
+    def __init__(self, games, steam_app_list, workers=8, parent=None):
+        super().__init__(parent)
+        self.games = list(games)
+        self.pipeline = MetadataPipeline(
+            steam_app_list,
+            workers=workers,
+            on_progress=self.progress.emit,
+            on_batch=self.batch_processed.emit
+        )
 
-        self.details_processed.emit(self.game)
+    def cancel(self):
+        self.pipeline.cancel()
 
-class IconExtractorWorker(QThread):
-    icon_processed = pyqtSignal(object, QPixmap)
-    
-    def __init__(self, game, parent=None):
-        super().__init__(parent)
+    def run(self):
+        self.pipeline.run(self.games)
+
+class IconJob(QRunnable):
+    def __init__(self, game, pool):
+        super().__init__()
+        self.setAutoDelete(False)
         self.game = game
-        self.icons_dir = "game_icons"
-        os.makedirs(self.icons_dir, exist_ok=True)
+        self.pool = pool
+        self.icons_dir = ICONS_DIR
+        self.cancelled = False
 
     def run(self):
+        if self.cancelled:
+            self.pool.job_finished.emit(self, QImage(), False)
+            return
+        image = self.extract()
+        self.pool.job_finished.emit(self, image, True)
+
+    def extract(self):
         try:
             if self.game.icon_path and os.path.exists(self.game.icon_path):
-                pixmap = QPixmap(self.game.icon_path)
-                if not pixmap.isNull():
-                    self.icon_processed.emit(self.game, pixmap)
-                    return
-
-            safe_name = re.sub(r'[^\w]', '', (self.game.name or "game"))[:30]
-            output_path = os.path.join(self.icons_dir, f"{safe_name}.png")
+                image = self.load_icon(self.game.icon_path)
+                if not image.isNull():
+                    return image
+
+            # Executables are only parsed when the manifest has no verdict for
+            # their current size and mtime, including "no icon resource".
+            manifest = get_icon_manifest()
+            entry = manifest.lookup(self.game.exe_path)
+            if entry is not None:
+                if entry['status'] == STATUS_NO_ICON:
+                    return self.placeholder()
+                self.game.icon_path = entry['icon_path']
+                return self.load_icon(self.game.icon_path)
+
+            os.makedirs(self.icons_dir, exist_ok=True)
+            output_path = temp_path(self.icons_dir, ".png")
             
             try:
                 extractor = IconExtractor(self.game.exe_path)
                 extractor.export_icon(output_path) 
-                self.game.icon_path = output_path
-                pixmap = QPixmap(output_path)
-                self.icon_processed.emit(self.game, pixmap)
-            except Exception:
-                pixmap = self.generate_placeholder_icon()
-                self.icon_processed.emit(self.game, pixmap)
+                self.game.icon_path = store_file(self.icons_dir, output_path, ".png")
+                size = QImageReader(self.game.icon_path).size()
+                manifest.record(self.game.exe_path, STATUS_ICON, self.game.icon_path,
+                                [size.width(), size.height()] if size.isValid() else None)
+                return self.load_icon(self.game.icon_path)
+            except Exception as e:
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                if not isinstance(e, OSError):
+                    manifest.record(self.game.exe_path, STATUS_NO_ICON)
+                return self.placeholder()
         except Exception:
-            pixmap = self.generate_placeholder_icon()
-            self.icon_processed.emit(self.game, pixmap)
-
-    def generate_placeholder_icon(self):
-        pixmap = QPixmap(256, 256)
-        pixmap.fill(Qt.transparent)
-        painter = QPainter(pixmap)
-        gradient = QLinearGradient(0, 0, 256, 256)
-        gradient.setColorAt(0, QColor("#333333"))
-        gradient.setColorAt(1, QColor("#1a1a1a"))
-        painter.setBrush(QBrush(gradient))
-        painter.setPen(Qt.NoPen)
-        painter.drawRoundedRect(0, 0, 256, 256, 30, 30)
-        letter = (self.game.name[0].upper() if self.game.name else "G")
-        font = QFont("Segoe UI", 100, QFont.Bold)
-        painter.setFont(font)
-        painter.setPen(QColor("#f0f4f6"))
-        painter.drawText(pixmap.rect(), Qt.AlignCenter, letter)
-        painter.end()
-        self.save_icon(pixmap)
-        return pixmap
-
-    def save_icon(self, pixmap):
-        try:
-            safe_name = re.sub(r'[^\w]', '', (self.game.name or ""))[:30]
-            filename = safe_name + ".png"
-            icon_path = os.path.join(self.icons_dir, filename)
-            pixmap.save(icon_path, "PNG")
-            self.game.icon_path = icon_path 
-        except Exception:
-            pass
\ No newline at end of file
+            return self.placeholder()
+
+    def load_icon(self, icon_path):
+        thumbnail = ensure_thumbnail(icon_path, LIST_ICON_SIZE, LIST_ICON_SIZE, self.pool.dpr)
+        return QImage(thumbnail or icon_path)
+
+    def placeholder(self):
+        return placeholder_image(self.game.name, LIST_ICON_SIZE, self.pool.dpr)
+
+
+class IconWorkerPool(QObject):
+    icon_processed = pyqtSignal(object, QImage)
+    job_finished = pyqtSignal(object, QImage, bool)
+
+    def __init__(self, max_threads=None, dpr=1.0, parent=None):
+        super().__init__(parent)
+        self.dpr = dpr
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads or os.cpu_count() or 4)
+        self.jobs = {}
+        self.priorities = {}
+        self.manifest_timer = QTimer(self)
+        self.manifest_timer.setSingleShot(True)
+        self.manifest_timer.setInterval(2000)
+        self.manifest_timer.timeout.connect(get_icon_manifest().save)
+        self.job_finished.connect(self.on_job_finished)
+
+    def request(self, game, priority=0):
+        job = self.jobs.get(game.exe_path)
+        if job is not None:
+            job.cancelled = False
+            if priority > self.priorities[game.exe_path] and self.pool.tryTake(job):
+                self.priorities[game.exe_path] = priority
+                self.pool.start(job, priority)
+            return
+        job = IconJob(game, self)
+        self.jobs[game.exe_path] = job
+        self.priorities[game.exe_path] = priority
+        self.pool.start(job, priority)
+
+    def cancel(self, exe_path):
+        job = self.jobs.get(exe_path)
+        if job is None:
+            return
+        if self.pool.tryTake(job):
+            del self.jobs[exe_path]
+            del self.priorities[exe_path]
+        else:
+            job.cancelled = True
+
+    def retain(self, exe_paths):
+        for exe_path in list(self.jobs):
+            if exe_path not in exe_paths:
+                self.cancel(exe_path)
+
+    def on_job_finished(self, job, image, completed):
+        exe_path = job.game.exe_path
+        if self.jobs.get(exe_path) is job:
+            del self.jobs[exe_path]
+            del self.priorities[exe_path]
+        if completed:
+            self.manifest_timer.start()
+            self.icon_processed.emit(job.game, image)
+
+    def shutdown(self, timeout=3000):
+        for exe_path in list(self.jobs):
+            self.cancel(exe_path)
+        self.pool.waitForDone(timeout)
+        self.manifest_timer.stop()
+        get_icon_manifest().save()